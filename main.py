@@ -2,9 +2,6 @@ import sys
 import pandas as pd
 from PyQt6.QtWidgets import QApplication, QWidget
 
-from src.CeusTool3d.selectImage_ui_helper import SelectImageGUI_CeusTool3d
-from src.CeusMcTool2d.selectImage_ui_helper import SelectImageGUI_CeusMcTool2d
-from src.QusTool2d.selectImage_ui_helper import SelectImageGUI_QusTool2dIQ
 from welcome_ui import Ui_qusPage
 
 
@@ -29,7 +26,10 @@ class QusGui(Ui_qusPage, QWidget):
             ]
         )
 
+    # Each tool is imported on first use so the welcome page opens without loading every tool's stack
     def moveToQus2d(self):
+        from src.QusTool2d.selectImage_ui_helper import SelectImageGUI_QusTool2dIQ
+
         del self.nextPage
         self.nextPage = SelectImageGUI_QusTool2dIQ()
         self.nextPage.show()
@@ -37,6 +37,8 @@ class QusGui(Ui_qusPage, QWidget):
         self.hide()
 
     def moveToDceus3d(self):
+        from src.CeusTool3d.selectImage_ui_helper import SelectImageGUI_CeusTool3d
+
         del self.nextPage
         self.nextPage = SelectImageGUI_CeusTool3d()
         self.nextPage.show()
@@ -45,6 +47,8 @@ class QusGui(Ui_qusPage, QWidget):
         self.hide()
 
     def moveToDceusMc2d(self):
+        from src.CeusMcTool2d.selectImage_ui_helper import SelectImageGUI_CeusMcTool2d
+
         del self.nextPage
         self.nextPage = SelectImageGUI_CeusMcTool2d()
         self.nextPage.dataFrame = self.ceus2dMcData
@@ -2,6 +2,7 @@ import platform
 import os
 
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib.colors as colors
@@ -15,6 +16,14 @@ from src.CeusMcTool2d.genParamap_ui_helper import GenParamapGUI, ParamapInputs
 
 system = platform.system()
 
+# Toggle button, colormap and masterParamap channel per parameter
+paramapDisplays = {
+    "AUC": ("aucParamapButton", "viridis", 0),
+    "PE": ("peParamapButton", "magma", 1),
+    "TP": ("tpParamapButton", "plasma", 2),
+    "MTT": ("mttParamapButton", "cividis", 3),
+}
+
 def truncate_colormap(cmap, minval=0.0, maxval=1.0, n=100):
     new_cmap = colors.LinearSegmentedColormap.from_list(
         "trunc({n},{a:.2f},{b:.2f})".format(n=cmap.name, a=minval, b=maxval),
@@ -199,6 +208,7 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         self.genParamapGUI = None
         self.roiArea = None
         self.newData = None
+        self.pendingRows = []
         self.axRes, self.latRes, self.cineRate, self.fullPath, self.mc = None, None, None, None, None
 
 
@@ -231,19 +241,30 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         self.backFromParamapButton.clicked.connect(self.backFromParamap)
         self.loadParamapButton.clicked.connect(self.loadParamaps)
         self.aucParamapButton.setCheckable(True)
-        self.aucParamapButton.clicked.connect(self.showAuc)
+        self.aucParamapButton.clicked.connect(lambda: self.showParamap("AUC"))
         self.peParamapButton.setCheckable(True)
-        self.peParamapButton.clicked.connect(self.showPe)
+        self.peParamapButton.clicked.connect(lambda: self.showParamap("PE"))
         self.mttParamapButton.setCheckable(True)
-        self.mttParamapButton.clicked.connect(self.showMtt)
+        self.mttParamapButton.clicked.connect(lambda: self.showParamap("MTT"))
         self.tpParamapButton.setCheckable(True)
-        self.tpParamapButton.clicked.connect(self.showTp)
+        self.tpParamapButton.clicked.connect(lambda: self.showParamap("TP"))
 
         self.horizontalLayout = QHBoxLayout(self.legend)
         self.horizontalLayout.setObjectName("horizontalLayout")
         self.figure_leg = plt.figure()
         self.canvas_leg = FigureCanvas(self.figure_leg)
         self.horizontalLayout.addWidget(self.canvas_leg)
+        self.ax_leg = self.figure_leg.add_subplot(111)
+        self.legendIm = self.ax_leg.imshow(
+            np.linspace(0,100,1000).reshape((1000,1)), aspect='auto', origin='lower'
+        )
+        self.ax_leg.tick_params(axis='y', labelsize=5, pad=0.4)
+        self.ax_leg.set_xticks([])
+        self.ax_leg.set_yticks([0, 250, 500, 750, 1000])
+        self.figure_leg.subplots_adjust(
+            left=0.4, right=0.95, bottom=0.05, top=0.96
+        )
+        self.ax_leg.set_visible(False)
         self.curAlpha = 255
 
         # self.aucParamap = None
@@ -265,263 +286,49 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         self.saveDataButton.clicked.connect(self.saveData)
         self.genParamapButton.clicked.connect(self.startGenParamap)
 
-    def showAuc(self):
-        self.figure_leg.clear()
-        if self.aucParamapButton.isChecked():
-            self.peParamapButton.setChecked(False)
-            self.tpParamapButton.setChecked(False)
-            self.mttParamapButton.setChecked(False)
-
-            self.curParamap = 1
-            self.cmap = plt.get_cmap("viridis").colors
-            self.ax_leg = self.figure_leg.add_subplot(111)
-
-            arr = np.linspace(0,100,1000).reshape((1000,1))
-            new_cmap1 = truncate_colormap(plt.get_cmap("viridis"))
-            self.ax_leg.imshow(arr, aspect='auto', cmap=new_cmap1, origin='lower')
-            self.ax_leg.tick_params(axis='y', labelsize=5, pad=0.4)
-            self.ax_leg.set_xticks([])
-            self.ax_leg.set_yticks([0, 250, 500, 750, 1000])
-            self.ax_leg.set_yticklabels(
-                [
-                    np.round(self.minAuc, decimals=1),
-                    np.round(
-                        self.minAuc + ((self.maxAuc - self.minAuc) / 4), decimals=1
-                    ),
-                    np.round(
-                        self.minAuc + (2*(self.maxAuc - self.minAuc) / 4), decimals=1
-                    ),
-                    np.round(
-                        self.minAuc + (3 * (self.maxAuc - self.minAuc) / 4), decimals=1
-                    ),
-                    np.round(self.maxAuc, decimals=1),
-                ]
-            )
-            self.figure_leg.subplots_adjust(
-                left=0.4, right=0.95, bottom=0.05, top=0.96
-            )
-            self.canvas_leg.draw()
-
-            for point in self.pointsPlotted:
-                if self.maxAuc == self.minAuc:
-                    color = self.cmap[125]
-                else:
-                    aucVal = self.masterParamap[point[0], point[1], 0]
-                    if not self.masterParamap[point[0], point[1], 3]:
-                        color = [0, 0, 0]  # window not able to be fit
-                    elif self.maxAuc == self.minAuc:
-                        color = self.cmap[125]
-                    else:
-                        color = self.cmap[
-                            int(
-                                (255 / (self.maxAuc - self.minAuc))
-                                * (aucVal - self.minAuc)
-                            )
-                        ]
-                self.paramap[point[0], point[1]] = [
-                    int(color[2] * 255),
-                    int(color[1] * 255),
-                    int(color[0] * 255),
-                    int(self.curAlpha),
-                ]
-        else:
-            self.curParamap = 0
-            self.canvas_leg.draw()
-        self.updateIm()
+    def clearParamap(self):
+        self.curParamap = 0
+        self.ax_leg.set_visible(False)
+        self.canvas_leg.draw_idle()
 
-    def showPe(self):
-        self.figure_leg.clear()
-        if self.peParamapButton.isChecked():
-            self.aucParamapButton.setChecked(False)
-            self.tpParamapButton.setChecked(False)
-            self.mttParamapButton.setChecked(False)
-
-            self.curParamap = 2
-            self.cmap = plt.get_cmap("magma").colors
-            self.ax_leg = self.figure_leg.add_subplot(111)
-
-            arr = np.linspace(0,100,1000).reshape((1000,1))
-            new_cmap1 = truncate_colormap(plt.get_cmap("magma"))
-            self.ax_leg.imshow(arr, aspect='auto', cmap=new_cmap1, origin='lower')
-            self.ax_leg.tick_params(axis='y', labelsize=5, pad=0.4)
-            self.ax_leg.set_xticks([])
-            self.ax_leg.set_yticks([0, 250, 500, 750, 1000])
-            self.ax_leg.set_yticklabels(
-                [
-                    np.round(self.minPe, decimals=1),
-                    np.round(
-                        self.minPe + ((self.maxPe - self.minPe) / 4), decimals=1
-                    ),
-                    np.round(
-                        self.minPe + (2*(self.maxPe - self.minPe) / 4), decimals=1
-                    ),
-                    np.round(
-                        self.minPe + (3 * (self.maxPe - self.minPe) / 4), decimals=1
-                    ),
-                    np.round(self.maxPe, decimals=1),
-                ]
-            )
-            self.figure_leg.subplots_adjust(
-                left=0.4, right=0.95, bottom=0.05, top=0.96
-            )
-            self.canvas_leg.draw()
-
-            for point in self.pointsPlotted:
-                if self.maxPe == self.minPe:
-                    color = self.cmap[125]
-                else:
-                    peVal = self.masterParamap[point[0], point[1], 1]
-                    if not self.masterParamap[point[0], point[1], 3]:
-                        color = [0, 0, 0]  # window not able to be fit
-                    elif self.maxPe == self.minPe:
-                        color = self.cmap[125]
-                    else:
-                        color = self.cmap[
-                            int(
-                                (255 / (self.maxPe - self.minPe))
-                                * (peVal - self.minPe)
-                            )
-                        ]
-                self.paramap[point[0], point[1]] = [
-                    int(color[2] * 255),
-                    int(color[1] * 255),
-                    int(color[0] * 255),
-                    int(self.curAlpha),
-                ]
-        else:
-            self.curParamap = 0
-            self.canvas_leg.draw()
-        self.updateIm()
-    
-    def showTp(self):
-        self.figure_leg.clear()
-        if self.tpParamapButton.isChecked():
-            self.peParamapButton.setChecked(False)
-            self.aucParamapButton.setChecked(False)
-            self.mttParamapButton.setChecked(False)
-
-            self.curParamap = 3
-            self.cmap = plt.get_cmap("plasma").colors
-            self.ax_leg = self.figure_leg.add_subplot(111)
-
-            arr = np.linspace(0,100,1000).reshape((1000,1))
-            new_cmap1 = truncate_colormap(plt.get_cmap("plasma"))
-            self.ax_leg.imshow(arr, aspect='auto', cmap=new_cmap1, origin='lower')
-            self.ax_leg.tick_params(axis='y', labelsize=5, pad=0.4)
-            self.ax_leg.set_xticks([])
-            self.ax_leg.set_yticks([0, 250, 500, 750, 1000])
+    def showParamap(self, name):
+        buttonName, cmapName, channel = paramapDisplays[name]
+        if getattr(self, buttonName).isChecked():
+            for otherButtonName, _, _ in paramapDisplays.values():
+                if otherButtonName != buttonName:
+                    getattr(self, otherButtonName).setChecked(False)
+
+            minVal, maxVal = self.paramapRanges[name]
+            self.curParamap = channel + 1
+            self.cmap = plt.get_cmap(cmapName).colors
+
+            self.legendIm.set_cmap(truncate_colormap(plt.get_cmap(cmapName)))
             self.ax_leg.set_yticklabels(
                 [
-                    np.round(self.minTp, decimals=1),
-                    np.round(
-                        self.minTp + ((self.maxTp - self.minTp) / 4), decimals=1
-                    ),
-                    np.round(
-                        self.minTp + (2*(self.maxTp - self.minTp) / 4), decimals=1
-                    ),
-                    np.round(
-                        self.minTp + (3 * (self.maxTp - self.minTp) / 4), decimals=1
-                    ),
-                    np.round(self.maxTp, decimals=1),
+                    np.round(minVal + (i * (maxVal - minVal) / 4), decimals=1)
+                    for i in range(5)
                 ]
             )
-            self.figure_leg.subplots_adjust(
-                left=0.4, right=0.95, bottom=0.05, top=0.96
-            )
-            self.canvas_leg.draw()
-
-            for point in self.pointsPlotted:
-                if self.maxTp == self.minTp:
-                    color = self.cmap[125]
-                else:
-                    tpVal = self.masterParamap[point[0], point[1], 1]
-                    if not self.masterParamap[point[0], point[1], 3]:
-                        color = [0, 0, 0]  # window not able to be fit
-                    elif self.maxTp == self.minTp:
-                        color = self.cmap[125]
-                    else:
-                        color = self.cmap[
-                            min(int(
-                                (255 / (self.maxTp - self.minTp))
-                                * (tpVal - self.minTp)
-                            ), 255
-                            )
-                        ]
-                self.paramap[point[0], point[1]] = [
-                    int(color[2] * 255),
-                    int(color[1] * 255),
-                    int(color[0] * 255),
-                    int(self.curAlpha),
-                ]
+            self.ax_leg.set_visible(True)
+            self.canvas_leg.draw_idle()
+
+            self.paintParamap(self.masterParamap[..., channel], minVal, maxVal)
         else:
-            self.curParamap = 0
-            self.canvas_leg.draw()
+            self.clearParamap()
         self.updateIm()
 
-    def showMtt(self):
-        self.figure_leg.clear()
-        if self.mttParamapButton.isChecked():
-            self.peParamapButton.setChecked(False)
-            self.tpParamapButton.setChecked(False)
-            self.aucParamapButton.setChecked(False)
-            
-            self.curParamap = 4
-            self.cmap = plt.get_cmap("cividis").colors
-            self.ax_leg = self.figure_leg.add_subplot(111)
-
-            arr = np.linspace(0,100,1000).reshape((1000,1))
-            new_cmap1 = truncate_colormap(plt.get_cmap("cividis"))
-            self.ax_leg.imshow(arr, aspect='auto', cmap=new_cmap1, origin='lower')
-            self.ax_leg.tick_params(axis='y', labelsize=5, pad=0.4)
-            self.ax_leg.set_xticks([])
-            self.ax_leg.set_yticks([0, 250, 500, 750, 1000])
-            self.ax_leg.set_yticklabels(
-                [
-                    np.round(self.minMtt, decimals=1),
-                    np.round(
-                        self.minMtt + ((self.maxMtt - self.minMtt) / 4), decimals=1
-                    ),
-                    np.round(
-                        self.minMtt + (2*(self.maxMtt - self.minMtt) / 4), decimals=1
-                    ),
-                    np.round(
-                        self.minMtt + (3 * (self.maxMtt - self.minMtt) / 4), decimals=1
-                    ),
-                    np.round(self.maxMtt, decimals=1),
-                ]
-            )
-            self.figure_leg.subplots_adjust(
-                left=0.4, right=0.95, bottom=0.05, top=0.96
-            )
-            self.canvas_leg.draw()
-
-            for point in self.pointsPlotted:
-                if self.maxMtt == self.minMtt:
-                    color = self.cmap[125]
-                else:
-                    mttVal = self.masterParamap[point[0], point[1], 1]
-                    if not self.masterParamap[point[0], point[1], 3]:
-                        color = [0, 0, 0]  # window not able to be fit
-                    elif self.maxMtt == self.minMtt:
-                        color = self.cmap[125]
-                    else:
-                        color = self.cmap[
-                            int(
-                                (255 / (self.maxMtt - self.minMtt))
-                                * (mttVal - self.minMtt)
-                            )
-                        ]
-                self.paramap[point[0], point[1]] = [
-                    int(color[2] * 255),
-                    int(color[1] * 255),
-                    int(color[0] * 255),
-                    int(self.curAlpha),
-                ]
+    def paintParamap(self, paramVals, minVal, maxVal):
+        xs, ys = self.pointsPlotted[:, 0], self.pointsPlotted[:, 1]
+        cmap = np.asarray(self.cmap)
+        if maxVal == minVal:
+            pointColors = np.repeat(cmap[125][None], len(xs), axis=0)
         else:
-            self.curParamap = 0
-            self.canvas_leg.draw()
-        self.updateIm()
-    
+            norm = colors.Normalize(vmin=minVal, vmax=maxVal, clip=True)
+            pointColors = cmap[(255 * norm(paramVals[xs, ys])).astype(int)]
+            pointColors[self.masterParamap[xs, ys, 3] == 0] = 0  # window not able to be fit
+        self.paramap[xs, ys, :3] = (pointColors[:, ::-1] * 255).astype(int)
+        self.paramap[xs, ys, 3] = int(self.curAlpha)
+
     def startGenParamap(self):
         try:
             del self.genParamapGUI
@@ -595,119 +402,24 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
                 self.mcResultsArray.shape[1],
                 self.mcResultsArray.shape[2],
                 4,
-            )
+            ),
+            dtype=np.uint8,
         )
 
-        self.maxAuc = 0
-        self.minAuc = 99999999
-        self.maxPe = 0
-        self.minPe = 99999999
-        self.maxTp = 0
-        self.minTp = 99999999
-        self.maxMtt = 0
-        self.minMtt = 99999999
         if len(self.masterParamap.shape) == 3: # constant ROI
             xlist, ylist = np.where(np.sum(self.segCoverMask[self.curFrameIndex,self.y0_CE:self.y0_CE+self.h_CE,:], axis=2) > 0)
             self.pointsPlotted = np.transpose([xlist, ylist])
         else: #MC ROI
             return # implement once MC paramap can be run without running out of memory
 
-        for i in range(len(self.pointsPlotted)):
-            if (
-                self.masterParamap[
-                    self.pointsPlotted[i][0],
-                    self.pointsPlotted[i][1],
-                ][3]
-                != 0
-            ):
-                if (
-                    self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][0]
-                    > self.maxAuc
-                ):
-                    self.maxAuc = self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][0]
-                if (
-                    self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][0]
-                    < self.minAuc
-                ):
-                    self.minAuc = self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][0]
-                if (
-                    self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][1]
-                    > self.maxPe
-                ):
-                    self.maxPe = self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][1]
-                if (
-                    self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][1]
-                    < self.minPe
-                ):
-                    self.minPe = self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][1]
-                if (
-                    self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][2]
-                    > self.maxTp
-                ):
-                    self.maxTp = self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][2]
-                if (
-                    self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][2]
-                    < self.minTp
-                ):
-                    self.minTp = self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][2]
-                if (
-                    self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][3]
-                    > self.maxMtt
-                ):
-                    self.maxMtt = self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][3]
-                if (
-                    self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][3]
-                    < self.minMtt
-                ):
-                    self.minMtt = self.masterParamap[
-                        self.pointsPlotted[i][0],
-                        self.pointsPlotted[i][1],
-                    ][3]
+        voiParams = self.masterParamap[self.pointsPlotted[:, 0], self.pointsPlotted[:, 1], :4]
+        fitParams = voiParams[voiParams[:, 3] != 0]
+        minVals = fitParams.min(axis=0, initial=99999999)
+        maxVals = fitParams.max(axis=0, initial=0)
+        self.paramapRanges = {
+            name: (minVals[channel], maxVals[channel])
+            for name, (_, _, channel) in paramapDisplays.items()
+        }
 
         self.showTicButton.setHidden(True)
         self.loadParamapButton.setHidden(True)
@@ -770,7 +482,13 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         self.showTicButton.setHidden(False)
         self.loadParamapButton.setHidden(False)
 
+    def flushPendingRows(self):
+        if len(self.pendingRows):
+            self.dataFrame = pd.concat([self.dataFrame, pd.DataFrame(self.pendingRows)], ignore_index=True)
+            self.pendingRows = []
+
     def moveToExport(self):
+        self.flushPendingRows()
         if len(self.dataFrame):
             del self.exportDataGUI
             self.exportDataGUI = ExportDataGUI()
@@ -782,28 +500,19 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
 
     def saveData(self):
         if self.newData is None:
-            if self.axRes != -1:
-                self.newData = {
-                    "Patient": self.imagePathInput.text(),
-                    "Area Under Curve (AUC)": self.auc,
-                    "Peak Enhancement (PE)": self.pe,
-                    "Time to Peak (TP)": self.tp,
-                    "Mean Transit Time (MTT)": self.mtt,
-                    "ROI Area (mm^2)": self.roiArea*self.axRes*self.latRes,
-                }
-                self.dataFrame = self.dataFrame.append(self.newData, ignore_index=True)
-            else:
-                self.newData = {
-                    "Patient": self.imagePathInput.text(),
-                    "Area Under Curve (AUC)": self.auc,
-                    "Peak Enhancement (PE)": self.pe,
-                    "Time to Peak (TP)": self.tp,
-                    "Mean Transit Time (MTT)": self.mtt,
-                    "ROI Area (mm^2)": self.roiArea,
-                }
-                self.dataFrame = self.dataFrame.append(self.newData, ignore_index=True)
+            roiArea = self.roiArea*self.axRes*self.latRes if self.axRes != -1 else self.roiArea
+            self.newData = {
+                "Patient": self.imagePathInput.text(),
+                "Area Under Curve (AUC)": self.auc,
+                "Peak Enhancement (PE)": self.pe,
+                "Time to Peak (TP)": self.tp,
+                "Mean Transit Time (MTT)": self.mtt,
+                "ROI Area (mm^2)": roiArea,
+            }
+            self.pendingRows.append(self.newData)
 
     def backToLastScreen(self):
+        self.flushPendingRows()
         self.lastGui.dataFrame = self.dataFrame
         self.lastGui.fig.subplots_adjust(left=0.1, right=0.97, top=0.9, bottom=0.1)
         self.lastGui.show()
@@ -840,8 +549,8 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         self.maskCoverLabel.move(self.imX0, self.imY0)
         self.maskCoverLabel.resize(self.widthScale, self.depthScale)
 
-        self.mcData = np.require(self.mcResultsArray[self.curFrameIndex], np.uint8, "C")
-        self.bytesLine, _ = self.mcData[:, :, 0].strides
+        self.mcData = self.mcResultsArray[self.curFrameIndex]
+        self.bytesLine = self.mcData.strides[0]
         self.qImg = QImage(
             self.mcData, self.x, self.y, self.bytesLine, QImage.Format.Format_RGB888
         )
@@ -851,16 +560,12 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
 
         if self.curParamap:
             if len(self.masterParamap.shape) == 3: # constant ROI
-                self.maskCoverImg = np.require(
-                    self.paramap, np.uint8, "C"
-                )
+                self.maskCoverImg = self.paramap
             else:
                 pass # implement MC once works
         else:
-            self.maskCoverImg = np.require(
-                self.segCoverMask[self.curFrameIndex], np.uint8, "C"
-            )
-        self.bytesLineMask, _ = self.maskCoverImg[:, :, 0].strides
+            self.maskCoverImg = self.segCoverMask[self.curFrameIndex]
+        self.bytesLineMask = self.maskCoverImg.strides[0]
         self.qImgMask = QImage(
             self.maskCoverImg, self.x, self.y, self.bytesLineMask, QImage.Format.Format_ARGB32
         )
@@ -871,7 +576,7 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
     def setFilenameDisplays(self, imageName):
         self.imagePathInput.setHidden(False)
 
-        imFile = imageName.split("/")[-1]
+        imFile = os.path.basename(imageName)
 
         self.imagePathInput.setText(imFile)
         self.inputTextPath = imageName
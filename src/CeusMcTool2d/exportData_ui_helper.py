@@ -119,7 +119,7 @@ class ExportDataGUI(Ui_exportData, QWidget):
     def setFilenameDisplays(self, imageName):
         self.imagePathInput.setHidden(False)
 
-        imFile = imageName.split("/")[-1]
+        imFile = os.path.basename(imageName)
 
         self.imagePathInput.setText(imFile)
         self.inputTextPath = imageName
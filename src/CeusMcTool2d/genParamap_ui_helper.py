@@ -1,19 +1,21 @@
 import os
 import re
+from dataclasses import dataclass
 
+import numpy as np
 from PyQt6.QtWidgets import QWidget, QFileDialog
 
 from src.CeusMcTool2d.genParamap_ui import Ui_genParamap
 from src.Utils.ceusParamap2d import get_paramap2d
 
-class ParamapInputs():
-    def __init__(self):
-        self.image = None
-        self.seg_mask = None
-        self.res0 = None
-        self.res1 = None
-        self.timeConst = None
-        self.mc = None
+@dataclass(slots=True)
+class ParamapInputs:
+    image: np.ndarray | None = None
+    seg_mask: np.ndarray | None = None
+    res0: float | None = None
+    res1: float | None = None
+    timeConst: float | None = None
+    mc: bool | None = None
 
 class GenParamapGUI(Ui_genParamap, QWidget):
     def __init__(self, inputs: ParamapInputs):
@@ -5,17 +5,17 @@ import cv2
 import numpy as np
 import pydicom as dicom
 import nibabel as nib
-import scipy.interpolate as interpolate
 from scipy.ndimage import binary_fill_holes
 from pydicom.pixel_data_handlers import convert_color_space
 from PyQt6.QtWidgets import QWidget, QApplication, QFileDialog
 from PyQt6.QtGui import QPixmap, QPainter, QImage, QMouseEvent
-from PyQt6.QtCore import QLine, Qt
+from PyQt6.QtCore import QLine, Qt, QTimer
 
 import src.Utils.motionCorrection as mc
 from src.CeusMcTool2d.roiSelection_ui import Ui_constructRoi
 from src.CeusMcTool2d.ticAnalysis_ui_helper import TicAnalysisGUI
 from src.CeusMcTool2d.saveRoi_ui_helper import SaveRoiGUI
+from src.Utils.spline import calculateSpline, removeDuplicates
 
 import platform
 
@@ -137,10 +137,17 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
         self.curLeftLineX = -1
 
         self.imDrawn = 0
+        self.splineBounds = {}
         self.axRes, self.latRes, self.cineRate, self.fullPath, self.mc = -1, -1, None, None, False
 
         self.setMouseTracking(True)
 
+        # Bursts of clicks collapse into a single spline/mask repaint
+        self.splineTimer = QTimer(self)
+        self.splineTimer.setSingleShot(True)
+        self.splineTimer.setInterval(0)
+        self.splineTimer.timeout.connect(self.updateSpline)
+
         self.backButton.clicked.connect(self.backToLastScreen)
         self.newRoiButton.clicked.connect(self.drawNewRoi)
         self.loadRoiButton.clicked.connect(self.startLoadRoi)
@@ -216,7 +223,7 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
         self.mcResultsArray = self.fullArray
 
         self.segMask = mask
-        self.segCoverMask = np.zeros((self.numSlices, self.y, self.x, 4))
+        self.segCoverMask = np.zeros((self.numSlices, self.y, self.x, 4), dtype=np.uint8)
         self.pointsPlotted = np.transpose(maskPoints)
         for point in self.pointsPlotted:
             self.segCoverMask[point[0], point[1], point[2]] = [128, 0, 128, 100]
@@ -253,7 +260,7 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
     def setFilenameDisplays(self, imageName):
         self.imagePathInput.setHidden(False)
 
-        imFile = imageName.split("/")[-1]
+        imFile = os.path.basename(imageName)
 
         self.imagePathInput.setText(imFile)
         self.inputTextPath = imageName
@@ -273,7 +280,7 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
 
             self.mcResultsArray = self.fullArray
 
-            self.segCoverMask = np.zeros((self.numSlices, self.y, self.x, 4))
+            self.segCoverMask = np.zeros((self.numSlices, self.y, self.x, 4), dtype=np.uint8)
             self.segMask = np.zeros((self.numSlices, self.y, self.x))
 
             bmodeMask = np.zeros((self.y, self.x))
@@ -746,7 +753,7 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
 
             # Repurpose self.segMask to hold mc results
             del self.segMask
-            self.segCoverMask = np.zeros((self.numSlices, self.y, self.x, 4))
+            self.segCoverMask = np.zeros((self.numSlices, self.y, self.x, 4), dtype=np.uint8)
             self.segMask = np.zeros((self.numSlices, self.y, self.x))
             xDiff = self.x0_CE - self.x0_bmode
             yDiff = self.y0_CE - self.y0_bmode
@@ -842,6 +849,8 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
             del self.segCoverMask
         except AttributeError:
             pass
+        # maskCoverImg was a view into the discarded mask; give drawing its own buffer again
+        self.maskCoverImg = np.zeros([self.y, self.x, 4], dtype=np.uint8)
         self.undoLastRoi()
         self.updateIm()
         self.update()
@@ -858,10 +867,10 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
 
     def openNiftiImage(self, bmodePath, cePath):
         bmodeFile = nib.load(bmodePath)
-        bmode = np.array(bmodeFile.get_fdata(caching="unchanged")).astype(np.uint8)
+        bmode = np.asarray(bmodeFile.get_fdata(caching="unchanged")).astype(np.uint8)
         del bmodeFile
         ceFile = nib.load(cePath)
-        contrastEnhanced = np.array(ceFile.get_fdata(caching="unchanged")).astype(
+        contrastEnhanced = np.asarray(ceFile.get_fdata(caching="unchanged")).astype(
             np.uint8
         )
         del ceFile
@@ -903,7 +912,7 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
         self.axRes, self.latRes = 0.4, 0.4 # mm/pixel (hard-coded for Prostate Project)
         self.cineRate = 30  # frames/sec (hard-coded for Prostate Project)
 
-        self.maskCoverImg = np.zeros([self.y, self.x, 4])
+        self.maskCoverImg = np.zeros([self.y, self.x, 4], dtype=np.uint8)
         self.mask = np.zeros([self.y, self.x])
 
         self.imX0 = 350
@@ -1009,8 +1018,9 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
             return
         firstFrame = cv2.cvtColor(firstFrame, cv2.COLOR_RGB2BGR)
         self.fullArray = np.zeros(
-            (self.numSlices, firstFrame.shape[0], firstFrame.shape[1], 3)
-        ).astype(firstFrame.dtype)
+            (self.numSlices, firstFrame.shape[0], firstFrame.shape[1], 3),
+            dtype=firstFrame.dtype,
+        )
         self.fullArray[0] = firstFrame
         for i in range(1, self.numSlices):
             ret, frame = cap.read()
@@ -1066,7 +1076,7 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
         self.imCoverPixmap.fill(Qt.GlobalColor.transparent)
         self.imCoverLabel.setPixmap(self.imCoverPixmap)
 
-        self.maskCoverImg = np.zeros([self.y, self.x, 4])
+        self.maskCoverImg = np.zeros([self.y, self.x, 4], dtype=np.uint8)
 
         self.curSliceSlider.setMaximum(self.numSlices - 1)
         self.curSliceSpinBox.setMaximum(self.numSlices - 1)
@@ -1271,7 +1281,7 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
         self.sliceArray = np.round(
             [i * (1 / self.cineRate) for i in range(self.numSlices)], decimals=2
         ).astype(np.int32)
-        self.maskCoverImg = np.zeros([self.y, self.x, 4])
+        self.maskCoverImg = np.zeros([self.y, self.x, 4], dtype=np.uint8)
         self.curSliceSlider.setMaximum(self.numSlices - 1)
         self.curSliceSpinBox.setMaximum(self.numSlices - 1)
 
@@ -1579,6 +1589,21 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
         self.ceEndX = self.ceStartX + int(xScale * self.w_CE)
         self.ceStartY = self.imY0 + int(yScale * self.y0_CE)
         self.ceEndY = self.ceStartY + int(yScale * self.h_CE)
+        # Spline pixels stay one pixel inside the window they were drawn in (keyed by imDrawn)
+        self.splineBounds = {
+            1: (
+                self.x0_bmode + 1,
+                self.x0_bmode + self.w_bmode - 2,
+                self.y0_bmode + 1,
+                self.y0_bmode + self.h_bmode - 2,
+            ),
+            2: (
+                self.x0_CE + 1,
+                self.x0_CE + self.w_CE - 2,
+                self.y0_CE + 1,
+                self.y0_CE + self.h_CE - 2,
+            ),
+        }
         painter.drawRect(
             int(self.x0_bmode * xScale),
             int(self.y0_bmode * yScale),
@@ -1609,31 +1634,28 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
 
     def updateIm(self):
         if len(self.mcResultsArray):
-            self.mcData = np.require(
-                self.mcResultsArray[self.curFrameIndex], np.uint8, "C"
-            )
-            self.bytesLineMc, _ = self.mcData[:, :, 0].strides
+            self.mcData = self.mcResultsArray[self.curFrameIndex]
+            self.bytesLineMc = self.mcData.strides[0]
             self.qImgMc = QImage(
                 self.mcData, self.x, self.y, self.bytesLineMc, QImage.Format.Format_RGB888
             )
             self.mcImDisplayLabel.setPixmap(
                 QPixmap.fromImage(self.qImgMc).scaled(self.widthScale, self.depthScale)
             )
-            self.maskCoverImg = np.require(
-                self.segCoverMask[self.curFrameIndex], np.uint8, "C"
-            )
+            self.maskCoverImg = self.segCoverMask[self.curFrameIndex]
         else:
             self.imData = self.fullArray[self.curFrameIndex]
-            self.imData = np.require(self.imData, np.uint8, "C")
-            self.bytesLineIm, _ = self.imData[:, :, 0].strides
+            self.bytesLineIm = self.imData.strides[0]
             self.qImg = QImage(
                 self.imData, self.x, self.y, self.bytesLineIm, QImage.Format.Format_RGB888
             )
             self.imPlane.setPixmap(
                 QPixmap.fromImage(self.qImg).scaled(self.widthScale, self.depthScale)
             )
-            self.maskCoverImg = np.require(self.maskCoverImg, np.uint8, "C")
-        self.bytesLineMask, _ = self.maskCoverImg[:, :, 0].strides
+        self.updateMask()
+
+    def updateMask(self):  # Only the overlay changed, so leave the scaled frame pixmap alone
+        self.bytesLineMask = self.maskCoverImg.strides[0]
         self.qImgMask = QImage(
             self.maskCoverImg, self.x, self.y, self.bytesLineMask, QImage.Format.Format_ARGB32
         )
@@ -1672,16 +1694,17 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
 
         self.update()
 
+    def scheduleSpline(self):
+        if not self.splineTimer.isActive():
+            self.splineTimer.start()
+
     def updateSpline(self):
         if len(self.curPointsPlottedX) > 0:
             if self.spline is not None:
                 self.spline.remove()
 
             if len(self.curPointsPlottedX) > 1:
-                points = [
-                    (self.curPointsPlottedX[i], self.curPointsPlottedY[i])
-                    for i in range(len(self.curPointsPlottedX))
-                ]
+                points = np.column_stack((self.curPointsPlottedX, self.curPointsPlottedY))
                 self.curPointsPlottedX, self.curPointsPlottedY = np.transpose(
                     removeDuplicates(points)
                 )
@@ -1690,29 +1713,13 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
                 xSpline, ySpline = calculateSpline(
                     self.curPointsPlottedX, self.curPointsPlottedY
                 )
-                spline = [
-                    (int(xSpline[i]), int(ySpline[i])) for i in range(len(xSpline))
-                ]
-                spline = np.array([*set(spline)])
-                xSpline, ySpline = np.transpose(spline)
-                if self.imDrawn == 1:
-                    xSpline = np.clip(
-                        xSpline,
-                        a_min=self.x0_bmode + 1,
-                        a_max=self.x0_bmode + self.w_bmode - 2,
-                    )
-                    ySpline = np.clip(
-                        ySpline,
-                        a_min=self.y0_bmode + 1,
-                        a_max=self.y0_bmode + self.h_bmode - 2,
-                    )
-                elif self.imDrawn == 2:
-                    xSpline = np.clip(
-                        xSpline, a_min=self.x0_CE + 1, a_max=self.x0_CE + self.w_CE - 2
-                    )
-                    ySpline = np.clip(
-                        ySpline, a_min=self.y0_CE + 1, a_max=self.y0_CE + self.h_CE - 2
-                    )
+                xSpline, ySpline = np.transpose(
+                    removeDuplicates(np.column_stack((xSpline, ySpline)).astype(int))
+                )
+                if self.imDrawn in self.splineBounds:
+                    xMin, xMax, yMin, yMax = self.splineBounds[self.imDrawn]
+                    np.clip(xSpline, xMin, xMax, out=xSpline)
+                    np.clip(ySpline, yMin, yMax, out=ySpline)
                 # else:
                 #     xSpline = np.clip(xSpline, a_min=1, a_max=self.x-2)
                 #     ySpline = np.clip(ySpline, a_min=1, a_max=self.y-2)
@@ -1720,26 +1727,22 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
                 #     self.maskCoverImg[point[0], point[1]] = [0,0,0,0]
                 self.maskCoverImg.fill(0)
                 self.oldSpline = []
-                for i in range(len(xSpline)):
-                    self.maskCoverImg[
-                        ySpline[i] - 1 : ySpline[i] + 2, xSpline[i] - 1 : xSpline[i] + 2
-                    ] = [255, 255, 0, 255]
-                    # for j in range(3):
-                    #     for k in range(3):
-                    #         self.oldSpline.append([ySpline[i]-j-1, xSpline[i]-k-1])
+                paintPoints(self.maskCoverImg, xSpline, ySpline, 1, [255, 255, 0, 255])
             else:
                 self.maskCoverImg.fill(0)
                 self.oldSpline = []
-            for i in range(len(self.curPointsPlottedX)):
-                self.maskCoverImg[
-                    self.curPointsPlottedY[i] - 2 : self.curPointsPlottedY[i] + 3,
-                    self.curPointsPlottedX[i] - 2 : self.curPointsPlottedX[i] + 3,
-                ] = [0, 0, 255, 255]
+            paintPoints(
+                self.maskCoverImg,
+                self.curPointsPlottedX,
+                self.curPointsPlottedY,
+                2,
+                [0, 0, 255, 255],
+            )
         else:
             self.maskCoverImg.fill(0)
             self.oldSpline = []
 
-        self.updateIm()
+        self.updateMask()
         # self.updateCrosshair()
 
     def mousePressEvent(self, event: QMouseEvent):
@@ -1786,7 +1789,7 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
                 return
             self.curPointsPlottedX.append(self.actualX)
             self.curPointsPlottedY.append(self.actualY)
-            self.updateSpline()
+            self.scheduleSpline()
 
     def mouseMoveEvent(self, event: QMouseEvent):
         self.xCur = event.pos().x()
@@ -1796,56 +1799,41 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
     def acceptPolygon(self):
         # 2d interpolation
         if len(self.curPointsPlottedX) > 2:
+            self.splineTimer.stop()
             self.drawRoiButton.setChecked(False)
 
-            # remove duplicate points
-            points = np.transpose(
-                np.array([self.curPointsPlottedX, self.curPointsPlottedY])
+            # remove duplicate points, then close the loop back onto the first one
+            points = removeDuplicates(
+                np.column_stack((self.curPointsPlottedX, self.curPointsPlottedY))
             )
-            points = removeDuplicates(points)
-            [self.curPointsPlottedX, self.curPointsPlottedY] = np.transpose(points)
-            self.curPointsPlottedX = list(self.curPointsPlottedX)
-            self.curPointsPlottedY = list(self.curPointsPlottedY)
-            self.curPointsPlottedX.append(self.curPointsPlottedX[0])
-            self.curPointsPlottedY.append(self.curPointsPlottedY[0])
+            points = np.vstack((points, points[:1]))
+            self.curPointsPlottedX = list(points[:, 0])
+            self.curPointsPlottedY = list(points[:, 1])
             self.maskCoverImg.fill(0)
 
             xSpline, ySpline = calculateSpline(
                 self.curPointsPlottedX, self.curPointsPlottedY
             )
-            spline = [(int(xSpline[i]), int(ySpline[i])) for i in range(len(xSpline))]
-            spline = np.array([*set(spline)])
-            xSpline, ySpline = np.transpose(spline)
-            if self.imDrawn == 1:
-                xSpline = np.clip(
-                    xSpline,
-                    a_min=self.x0_bmode + 1,
-                    a_max=self.x0_bmode + self.w_bmode - 2,
-                )
-                ySpline = np.clip(
-                    ySpline,
-                    a_min=self.y0_bmode + 1,
-                    a_max=self.y0_bmode + self.h_bmode - 2,
-                )
-            elif self.imDrawn == 2:
-                xSpline = np.clip(
-                    xSpline, a_min=self.x0_CE + 1, a_max=self.x0_CE + self.w_CE - 2
-                )
-                ySpline = np.clip(
-                    ySpline, a_min=self.y0_CE + 1, a_max=self.y0_CE + self.h_CE - 2
-                )
+            xSpline, ySpline = np.transpose(
+                removeDuplicates(np.column_stack((xSpline, ySpline)).astype(int))
+            )
+            if self.imDrawn in self.splineBounds:
+                xMin, xMax, yMin, yMax = self.splineBounds[self.imDrawn]
+                np.clip(xSpline, xMin, xMax, out=xSpline)
+                np.clip(ySpline, yMin, yMax, out=ySpline)
             # else:
             #     xSpline = np.clip(xSpline, a_min=1, a_max=self.x-2)
             #     ySpline = np.clip(ySpline, a_min=1, a_max=self.y-2)
             self.oldSpline = []
-            for i in range(len(xSpline)):
-                self.maskCoverImg[
-                    ySpline[i] - 1 : ySpline[i] + 2, xSpline[i] - 1 : xSpline[i] + 2
-                ] = [0, 0, 255, 255]
-                for j in range(3):
-                    self.pointsPlotted.append((xSpline[i] - j, ySpline[i] - j))
-                    if not j:
-                        self.pointsPlotted.append((xSpline[i] + j, ySpline[i] + j))
+            paintPoints(self.maskCoverImg, xSpline, ySpline, 1, [0, 0, 255, 255])
+            # Each spline pixel also seeds the two pixels diagonally up-left of it
+            diagonal = np.arange(3)
+            self.pointsPlotted.extend(
+                zip(
+                    (xSpline[:, None] - diagonal).ravel(),
+                    (ySpline[:, None] - diagonal).ravel(),
+                )
+            )
             self.curPointsPlottedX = []
             self.curPointsPlottedY = []
             self.redrawRoiButton.setHidden(False)
@@ -1853,18 +1841,14 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
             self.roiFitNoteLabel.setHidden(False)
             self.drawRoiButton.setChecked(False)
             self.drawRoiButton.setCheckable(False)
-            self.updateIm()
+            self.updateMask()
             # self.updateCrosshair()
 
     def undoLastPoint(self):
         if len(self.curPointsPlottedX) and (not len(self.pointsPlotted)):
-            self.maskCoverImg[
-                self.curPointsPlottedY[-1] - 2 : self.curPointsPlottedY[-1] + 3,
-                self.curPointsPlottedX[-1] - 2 : self.curPointsPlottedX[-1] + 3,
-            ] = [0, 0, 0, 0]
             self.curPointsPlottedX.pop()
             self.curPointsPlottedY.pop()
-            self.updateSpline()
+            self.scheduleSpline()
         if not len(self.curPointsPlottedX):
             self.imDrawn = 0
 
@@ -1886,7 +1870,7 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
             self.drawRoiButton.setCheckable(True)
             self.undoLastPtButton.setHidden(False)
             self.imDrawn = 0
-            self.updateIm()
+            self.updateMask()
             self.update()
 
     def computeTic(self):
@@ -1964,26 +1948,12 @@ class RoiSelectionGUI(Ui_constructRoi, QWidget):
         self.hide()
 
 
-def calculateSpline(xpts, ypts):  # 2D spline interpolation
-    cv = []
-    for i in range(len(xpts)):
-        cv.append([xpts[i], ypts[i]])
-    cv = np.array(cv)
-    if len(xpts) == 2:
-        tck, _ = interpolate.splprep(cv.T, s=0.0, k=1)
-    elif len(xpts) == 3:
-        tck, _ = interpolate.splprep(cv.T, s=0.0, k=2)
-    else:
-        tck, _ = interpolate.splprep(cv.T, s=0.0, k=3)
-    x, y = np.array(interpolate.splev(np.linspace(0, 1, 1000), tck))
-    return x, y
-
-
-def removeDuplicates(ar):
-    # Credit: https://stackoverflow.com/questions/480214/how-do-i-remove-duplicates-from-a-list-while-preserving-order
-    seen = set()
-    seen_add = seen.add
-    return [x for x in ar if not (tuple(x) in seen or seen_add(tuple(x)))]
+def paintPoints(img, xs, ys, radius, color):
+    # Stamp a (2*radius+1)^2 square around every point in one fancy-indexed write
+    offsets = np.arange(-radius, radius + 1)
+    rows = np.clip(np.add.outer(np.asarray(ys, dtype=int), offsets), 0, img.shape[0] - 1)
+    cols = np.clip(np.add.outer(np.asarray(xs, dtype=int), offsets), 0, img.shape[1] - 1)
+    img[rows[:, :, None], cols[:, None, :]] = color
 
 
 def find_x0_bmode_CE(ds, CE_side, width):
@@ -2083,7 +2053,8 @@ def load_cine(cine_array, color_channel):
             cine_array[frame, :, :, :], cv2.COLOR_RGB2GRAY
         )
 
-    cine_array = cine_array.astype(np.uint8)
+    # Only copies when the cine isn't already contiguous uint8 (e.g. broadcast MONOCHROME data)
+    cine_array = np.ascontiguousarray(cine_array, dtype=np.uint8)
     gray_cine_array = gray_cine_array.astype(np.uint8)
 
     return cine_array, gray_cine_array
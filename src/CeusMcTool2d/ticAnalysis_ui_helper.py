@@ -1,3 +1,4 @@
+import os
 import platform
 
 import numpy as np
@@ -123,6 +124,8 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
         self.horizLayout.addWidget(self.canvas)
         self.canvas.draw()
         self.ax = self.fig.add_subplot(111)
+        self.t0Background = None
+        self.canvas.mpl_connect("draw_event", self.cacheT0Background)
 
         self.selectT0Button.clicked.connect(self.initT0)
         self.automaticT0Button.clicked.connect(self.deferAutomaticT0)
@@ -199,8 +202,8 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
         self.maskDisplayLabel.move(self.imX0, self.imY0)
         self.maskDisplayLabel.resize(self.widthScale, self.depthScale)
 
-        self.mcData = np.require(self.mcResultsArray[self.curFrameIndex], np.uint8, "C")
-        self.bytesLineMc, _ = self.mcData[:, :, 0].strides
+        self.mcData = self.mcResultsArray[self.curFrameIndex]
+        self.bytesLineMc = self.mcData.strides[0]
         self.qImgMc = QImage(
             self.mcData, self.x, self.y, self.bytesLineMc, QImage.Format.Format_RGB888
         )
@@ -208,10 +211,8 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
             QPixmap.fromImage(self.qImgMc).scaled(self.widthScale, self.depthScale)
         )
 
-        self.maskCoverImg = np.require(
-            self.segCoverMask[self.curFrameIndex], np.uint8, "C"
-        )
-        self.bytesLineMask, _ = self.maskCoverImg[:, :, 0].strides
+        self.maskCoverImg = self.segCoverMask[self.curFrameIndex]
+        self.bytesLineMask = self.maskCoverImg.strides[0]
         self.qImgMask = QImage(
             self.maskCoverImg, self.x, self.y, self.bytesLineMask, QImage.Format.Format_ARGB32
         )
@@ -233,7 +234,8 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
             self.prevLine.remove()
             self.t0Index = -2
         self.prevLine = self.ax.axvline(
-            x=self.t0Slider.value(), color="green", label="axvline - full height"
+            x=self.t0Slider.value(), color="green", label="axvline - full height",
+            animated=True,
         )
         self.canvas.draw()
 
@@ -294,13 +296,18 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
 
         self.canvas.draw()
 
+    def cacheT0Background(self, event):
+        # t0 line is animated, so full draws leave it out of the cached background
+        if self.prevLine is not None and not self.t0Slider.isHidden():
+            self.t0Background = self.canvas.copy_from_bbox(self.ax.bbox)
+            self.ax.draw_artist(self.prevLine)
+
     def t0ScrollValueChanged(self):
-        self.prevLine.remove()
-        self.prevLine = self.ax.axvline(
-            x=self.t0Slider.value(), color="green", label="axvline - full height"
-        )
+        self.prevLine.set_xdata([self.t0Slider.value(), self.t0Slider.value()])
         self.sliceValueChanged()
-        self.canvas.draw()
+        self.canvas.restore_region(self.t0Background)
+        self.ax.draw_artist(self.prevLine)
+        self.canvas.blit(self.ax.bbox)
 
     def removeSelectedPoints(self):
         if len(self.selectedPoints):
@@ -331,7 +338,7 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
     def setFilenameDisplays(self, imageName):
         self.imagePathInput.setHidden(False)
 
-        imFile = imageName.split("/")[-1]
+        imFile = os.path.basename(imageName)
 
         self.imagePathInput.setText(imFile)
         self.inputTextPath = imageName
@@ -464,10 +471,8 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
         self.acceptTicButton.clicked.connect(self.acceptTIC)
 
         if self.t0Index == -2:
-            for i in range(len(self.ticX[:, 0])):
-                if self.ticX[:, 0][i] > self.t0Slider.value():
-                    break
-            self.t0Index = i
+            afterT0 = np.flatnonzero(self.ticX[:, 0] > self.t0Slider.value())
+            self.t0Index = int(afterT0[0]) if len(afterT0) else len(self.ticX) - 1
 
         self.selectedPoints = list(range(self.t0Index))
         if len(self.selectedPoints):
@@ -488,12 +493,9 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
         self.mask |= self.inside(event1, event2)
         x = self.ticX[:, 0][self.mask]
         y = self.ticY[self.mask]
-        addedIndices = np.sort(np.array(list(range(len(self.ticY))))[self.mask])
-        self.selectedPoints = []
-        for index in addedIndices:
-            self.selectedPoints.append(index)
+        self.selectedPoints = np.flatnonzero(self.mask).tolist()
         self.ax.scatter(x, y, color="orange")
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
     def inside(self, event1, event2):
         # Returns a boolean mask of the points inside the rectangle defined by
@@ -513,7 +515,7 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
             lastPt = self.selectedPoints[-1]
             self.selectedPoints.pop()
             self.ax.scatter(self.ticX[lastPt][0], self.ticY[lastPt], color="red")
-            self.canvas.draw()
+            self.canvas.draw_idle()
             self.mask = np.zeros(self.ticX[:, 0].shape, dtype=bool)
 
     def restoreLastPoints(self):
@@ -562,17 +564,18 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
             thisline = event.artist
             xdata = thisline.get_xdata()
             ind = event.ind[0]
-            if self.timeLine is not None:
-                self.timeLine.remove()
-            self.timeLine = self.ax.axvline(
-                x=xdata[ind],
-                color=(0, 0, 1, 0.3),
-                label="axvline - full height",
-                zorder=1,
-            )
+            if self.timeLine is None:
+                self.timeLine = self.ax.axvline(
+                    x=xdata[ind],
+                    color=(0, 0, 1, 0.3),
+                    label="axvline - full height",
+                    zorder=1,
+                )
+            else:
+                self.timeLine.set_xdata([xdata[ind], xdata[ind]])
             self.curFrameIndex = self.findSliceFromTime(xdata[ind])
             self.updateIm()
-            self.canvas.draw()
+            self.canvas.draw_idle()
 
 
 if __name__ == "__main__":
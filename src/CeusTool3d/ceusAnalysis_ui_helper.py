@@ -3,22 +3,31 @@ import platform
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.colors import Normalize
 import nibabel as nib
 from PIL.ImageQt import ImageQt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from PyQt6.QtWidgets import QWidget, QFileDialog, QHBoxLayout
 from PyQt6.QtGui import QImage, QPixmap, QPainter, QCursor, QResizeEvent
-from PyQt6.QtCore import QLine, Qt, QPoint, pyqtSlot
+from PyQt6.QtCore import QLine, Qt, QPoint, QTimer, pyqtSlot
 
 import src.Utils.lognormalFunctions as lf
 from src.CeusTool3d.ceusAnalysis_ui import Ui_ceusAnalysis
 from src.CeusTool3d.exportData_ui_helper import ExportDataGUI
 from src.CeusTool3d.legend_ui_helper import LegendDisplay
-from src.Utils.qtSupport import MouseTracker, qImToPIL
+from src.Utils.qtSupport import MouseTracker, loadBmode, qImToPIL
 
 
 system = platform.system()
 
+# Toggle button, colormap, masterParamap channel and legend decimals per parameter
+paramapDisplays = {
+    "AUC": ("aucParamapButton", "viridis", 0, 2),
+    "PE": ("peParamapButton", "magma", 1, 2),
+    "TP": ("tpParamapButton", "plasma", 2, 1),
+    "MTT": ("mttParamapButton", "cividis", 3, 1),
+}
+
 
 class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
     def __init__(self):
@@ -35,8 +44,17 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         self.sliceSliderChanged = False; self.masterParamap = None
         self.paramapPoints = None; self.curParamap = None; self.cmap = None
         self.newData = None; self.exportDataGUI = None
-        self.bmode4dImg = None; self.ceus4dImg = None
+        self.bmode4dImg = None; self.bmodeNibImg = None; self.ceus4dImg = None
         self.legendDisplay = LegendDisplay()
+        self.legendIm = self.legendDisplay.ax.imshow(
+            np.linspace(0, 100, 1000).reshape((1000, 1)), aspect="auto", origin="lower"
+        )
+        self.legendDisplay.ax.tick_params(axis="y", labelsize=7, pad=0.5)
+        self.legendDisplay.ax.set_xticks([])
+        self.legendDisplay.ax.set_yticks([0, 250, 500, 750, 1000])
+        self.legendDisplay.figure.subplots_adjust(
+            left=0.4, right=0.95, bottom=0.05, top=0.96
+        )
 
         self.hideParamapDisplayLayout(); self.hideTicDisplayLayout()
         self.showResultsViewLayout(); self.navigatingLabel.hide()
@@ -67,10 +85,10 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         self.showTicButton.clicked.connect(self.showTic)
         self.ticBackButton.clicked.connect(self.backFromTic)
         self.loadParamapsButton.clicked.connect(self.loadParamaps)
-        self.aucParamapButton.clicked.connect(self.displayAuc)
-        self.peParamapButton.clicked.connect(self.displayPe)
-        self.tpParamapButton.clicked.connect(self.displayTp)
-        self.mttParamapButton.clicked.connect(self.displayMtt)
+        self.aucParamapButton.clicked.connect(lambda: self.displayParamap("AUC"))
+        self.peParamapButton.clicked.connect(lambda: self.displayParamap("PE"))
+        self.tpParamapButton.clicked.connect(lambda: self.displayParamap("TP"))
+        self.mttParamapButton.clicked.connect(lambda: self.displayParamap("MTT"))
         self.paramapBackButton.clicked.connect(self.backFromParamap)
         self.showLegendButton.clicked.connect(self.displayLegend)
         self.showHideCrossButton.clicked.connect(self.showHideCross)
@@ -83,9 +101,15 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         trackerCor = MouseTracker(self.corPlane)
         trackerCor.positionChanged.connect(self.corCoordChanged) 
 
+        # Mouse tracking fires far faster than the three planes can be repainted
+        self.crosshairTimer = QTimer(self)
+        self.crosshairTimer.setSingleShot(True)
+        self.crosshairTimer.setInterval(33)
+        self.crosshairTimer.timeout.connect(self.updateCrosshairs)
+
     def toggleIms(self):
         if self.toggleButton.isChecked():
-            self.data4dImg = self.bmode4dImg
+            self.data4dImg = loadBmode(self)
         else:
             self.data4dImg = self.ceus4dImg
         self.updateCrosshairs() 
@@ -133,9 +157,11 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
 
             if xCoord < 0 or yCoord < 0 or xCoord >= self.axialPlane.pixmap().width() or yCoord >= self.axialPlane.pixmap().height():
                 return
-            self.newXVal = int((xCoord/self.axialPlane.pixmap().width()) * self.x)
-            self.newYVal = int((yCoord/self.axialPlane.pixmap().height()) * self.y)
-            self.updateCrosshairs()
+            newXVal = int((xCoord/self.axialPlane.pixmap().width()) * self.x)
+            newYVal = int((yCoord/self.axialPlane.pixmap().height()) * self.y)
+            if (newXVal, newYVal) != (self.newXVal, self.newYVal):
+                self.newXVal, self.newYVal = newXVal, newYVal
+                self.scheduleCrosshairs()
 
     @pyqtSlot(QPoint)
     def sagCoordChanged(self, pos):
@@ -146,9 +172,11 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
 
             if xCoord < 0 or yCoord < 0 or xCoord >= self.sagPlane.pixmap().width() or yCoord >= self.sagPlane.pixmap().height():
                 return
-            self.newZVal = int((xCoord/self.sagPlane.pixmap().width()) * self.z)
-            self.newYVal = int((yCoord/self.sagPlane.pixmap().height()) * self.y)
-            self.updateCrosshairs()
+            newZVal = int((xCoord/self.sagPlane.pixmap().width()) * self.z)
+            newYVal = int((yCoord/self.sagPlane.pixmap().height()) * self.y)
+            if (newZVal, newYVal) != (self.newZVal, self.newYVal):
+                self.newZVal, self.newYVal = newZVal, newYVal
+                self.scheduleCrosshairs()
         
     @pyqtSlot(QPoint)
     def corCoordChanged(self, pos):
@@ -159,9 +187,11 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
 
             if xCoord < 0 or yCoord < 0 or xCoord >= self.corPlane.pixmap().width() or yCoord >= self.corPlane.pixmap().height():
                 return
-            self.newXVal = int((xCoord/self.corPlane.pixmap().width()) * self.x)
-            self.newZVal = int((yCoord/self.corPlane.pixmap().height()) * self.z)
-            self.updateCrosshairs()
+            newXVal = int((xCoord/self.corPlane.pixmap().width()) * self.x)
+            newZVal = int((yCoord/self.corPlane.pixmap().height()) * self.z)
+            if (newXVal, newZVal) != (self.newXVal, self.newZVal):
+                self.newXVal, self.newZVal = newXVal, newZVal
+                self.scheduleCrosshairs()
 
     def showHideCross(self):
         if self.showHideCrossButton.isChecked():
@@ -201,144 +231,37 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         else:
             self.legendDisplay.show()
 
-    def displayAuc(self):
-        if not self.aucParamapButton.isChecked():
+    def displayParamap(self, name):
+        buttonName, cmapName, channel, decimals = paramapDisplays[name]
+        if not getattr(self, buttonName).isChecked():
             self.clearParamap()
-        else:
-            if self.peParamapButton.isChecked():
-                self.peParamapButton.setChecked(False)
-            if self.mttParamapButton.isChecked():
-                self.mttParamapButton.setChecked(False)
-            if self.tpParamapButton.isChecked():
-                self.tpParamapButton.setChecked(False)
-
-            self.cmap = plt.get_cmap("viridis").colors
-
-            arr = np.linspace(0, 100, 1000).reshape((1000, 1))
-            self.legendDisplay.ax.clear()
-            new_cmap1 = self.legendDisplay.truncate_colormap(plt.get_cmap("viridis"))
-            self.legendDisplay.ax.imshow(
-                arr, aspect="auto", cmap=new_cmap1, origin="lower"
-            )
-            self.legendDisplay.ax.tick_params(axis="y", labelsize=7, pad=0.5)
-            self.legendDisplay.ax.set_xticks([])
-            self.legendDisplay.ax.set_yticks([0, 250, 500, 750, 1000])
-            if not int(((self.maxAuc-self.minAuc) / 2) / 1000):
-                scale = 0
-                self.legendDisplay.legendLabel.setText("Parametric Map\nLegend:")
-            else:
-                scale = len(str(int((self.maxAuc-self.minAuc)/2)))
-                self.legendDisplay.legendLabel.setText(f"Parametric Map\nLegend: (1E{scale})")
-
-            self.legendDisplay.ax.set_yticklabels(
-                [
-                    np.round(self.minAuc/(10**scale), decimals=2),
-                    np.round(
-                        (self.minAuc + ((self.maxAuc - self.minAuc) / 4))/(10**scale), decimals=2
-                    ),
-                    np.round(
-                        (self.minAuc + ((self.maxAuc - self.minAuc) / 4))/(10**scale), decimals=2
-                    ),
-                    np.round(
-                        (self.minAuc + (3 * (self.maxAuc - self.minAuc) / 4))/(10**scale), decimals=2
-                    ),
-                    np.round(self.maxAuc/(10**scale), decimals=2),
-                ]
-            )
-            self.legendDisplay.figure.subplots_adjust(
-                left=0.4, right=0.95, bottom=0.05, top=0.96
-            )
-            self.legendDisplay.canvas.draw()
-            self.legendDisplay.legendFrame.setHidden(False)
-
-            for point in self.interpolatedPoints:
-                if self.maxAuc == self.minAuc:
-                    color = self.cmap[125]
-                else:
-                    aucVal = self.masterParamap[point[0], point[1], point[2], 0]
-                    if not self.masterParamap[point[0], point[1], point[2], 3]:
-                        color = [0, 0, 0]  # window not able to be fit
-                    elif self.maxAuc == self.minAuc:
-                        color = self.cmap[125]
-                    else:
-                        color = self.cmap[
-                            int(
-                                (255 / (self.maxAuc - self.minAuc))
-                                * (aucVal - self.minAuc)
-                            )
-                        ]
-                self.paramap[point[0], point[1], point[2]] = [
-                    int(color[2] * 255),
-                    int(color[1] * 255),
-                    int(color[0] * 255),
-                    int(self.curAlpha),
-                ]
+            return
+        for otherButtonName, _, _, _ in paramapDisplays.values():
+            if otherButtonName != buttonName:
+                getattr(self, otherButtonName).setChecked(False)
 
-            self.updateCrosshairs()
+        minVal, maxVal = self.paramapRanges[name]
+        self.cmap = plt.get_cmap(cmapName).colors
 
-    def displayPe(self):
-        if not self.peParamapButton.isChecked():
-            self.clearParamap()
-        else:
-            if self.aucParamapButton.isChecked():
-                self.aucParamapButton.setChecked(False)
-            if self.mttParamapButton.isChecked():
-                self.mttParamapButton.setChecked(False)
-            if self.tpParamapButton.isChecked():
-                self.tpParamapButton.setChecked(False)
-
-            arr = np.linspace(0, 100, 1000).reshape((1000, 1))
-            self.legendDisplay.ax.clear()
-            new_cmap1 = self.legendDisplay.truncate_colormap(plt.get_cmap("magma"))
-            self.legendDisplay.ax.imshow(
-                arr, aspect="auto", cmap=new_cmap1, origin="lower"
-            )
-            self.legendDisplay.ax.tick_params(axis="y", labelsize=7, pad=0.5)
+        self.legendIm.set_cmap(self.legendDisplay.truncate_colormap(plt.get_cmap(cmapName)))
+        if not int(((maxVal-minVal) / 2) / 1000):
+            scale = 0
             self.legendDisplay.legendLabel.setText("Parametric Map\nLegend:")
-            self.legendDisplay.ax.set_xticks([])
-            self.legendDisplay.ax.set_yticks([0, 250, 500, 750, 1000])
-            self.legendDisplay.ax.set_yticklabels(
-                [
-                    np.round(self.minPe, decimals=2),
-                    np.round(self.minPe + ((self.maxPe - self.minPe) / 4), decimals=2),
-                    np.round(self.minPe + ((self.maxPe - self.minPe) / 4), decimals=2),
-                    np.round(
-                        self.minPe + (3 * (self.maxPe - self.minPe) / 4), decimals=2
-                    ),
-                    np.round(self.maxPe, decimals=2),
-                ]
-            )
-            self.legendDisplay.figure.subplots_adjust(
-                left=0.4, right=0.95, bottom=0.05, top=0.96
-            )
-            self.legendDisplay.canvas.draw()
-            self.legendDisplay.legendFrame.setHidden(False)
-
-            self.cmap = plt.get_cmap("magma").colors
-
-            for point in self.interpolatedPoints:
-                if self.maxPe == self.minPe:
-                    color = self.cmap[125]
-                else:
-                    peVal = self.masterParamap[point[0], point[1], point[2], 1]
-                    if not self.masterParamap[point[0], point[1], point[2], 3]:
-                        color = [0, 0, 0]  # window not able to be fit
-                    elif self.maxPe == self.minPe:
-                        color = self.cmap[125]
-                    else:
-                        color = self.cmap[
-                            int(
-                                (255 / (self.maxPe - self.minPe)) * (peVal - self.minPe)
-                            )
-                        ]
-                self.paramap[point[0], point[1], point[2]] = [
-                    int(color[2] * 255),
-                    int(color[1] * 255),
-                    int(color[0] * 255),
-                    int(self.curAlpha),
-                ]
+        else:
+            scale = len(str(int((maxVal-minVal)/2)))
+            self.legendDisplay.legendLabel.setText(f"Parametric Map\nLegend: (1E{scale})")
+
+        self.legendDisplay.ax.set_yticklabels(
+            [
+                np.round((minVal + (i * (maxVal - minVal) / 4))/(10**scale), decimals=decimals)
+                for i in range(5)
+            ]
+        )
+        self.legendDisplay.canvas.draw_idle()
+        self.legendDisplay.legendFrame.setHidden(False)
 
-            self.updateCrosshairs()
+        self.paintParamap(self.masterParamap[..., channel], minVal, maxVal)
+        self.updateCrosshairs()
 
     def resizeEvent(self, event: QResizeEvent):
         super().resizeEvent(event)
@@ -347,138 +270,18 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         self.corPlane.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.updateCrosshairs()
 
-    def displayTp(self):
-        if not self.tpParamapButton.isChecked():
-            self.clearParamap()
-        else:
-            if self.aucParamapButton.isChecked():
-                self.aucParamapButton.setChecked(False)
-            if self.mttParamapButton.isChecked():
-                self.mttParamapButton.setChecked(False)
-            if self.peParamapButton.isChecked():
-                self.peParamapButton.setChecked(False)
-
-            self.cmap = plt.get_cmap("plasma").colors
-
-            arr = np.linspace(0, 100, 1000).reshape((1000, 1))
-            self.legendDisplay.ax.clear()
-            new_cmap1 = self.legendDisplay.truncate_colormap(plt.get_cmap("plasma"))
-            self.legendDisplay.ax.imshow(
-                arr, aspect="auto", cmap=new_cmap1, origin="lower"
-            )
-            self.legendDisplay.legendLabel.setText("Parametric Map\nLegend:")
-            self.legendDisplay.ax.tick_params(axis="y", labelsize=7, pad=0.5)
-            self.legendDisplay.ax.set_xticks([])
-            self.legendDisplay.ax.set_yticks([0, 250, 500, 750, 1000])
-            self.legendDisplay.ax.set_yticklabels(
-                [
-                    np.round(self.minTp, decimals=1),
-                    np.round(self.minTp + ((self.maxTp - self.minTp) / 4), decimals=1),
-                    np.round(self.minTp + ((self.maxTp - self.minTp) / 4), decimals=1),
-                    np.round(
-                        self.minTp + (3 * (self.maxTp - self.minTp) / 4), decimals=1
-                    ),
-                    np.round(self.maxTp, decimals=1),
-                ]
-            )
-            self.legendDisplay.figure.subplots_adjust(
-                left=0.4, right=0.95, bottom=0.05, top=0.96
-            )
-            self.legendDisplay.canvas.draw()
-            self.legendDisplay.legendFrame.setHidden(False)
-
-            for point in self.interpolatedPoints:
-                if self.maxTp == self.minTp:
-                    color = self.cmap[125]
-                else:
-                    tpVal = self.masterParamap[point[0], point[1], point[2], 2]
-                    if not self.masterParamap[point[0], point[1], point[2], 3]:
-                        color = [0, 0, 0]  # window not able to be fit
-                    elif self.maxTp == self.minTp:
-                        color = self.cmap = 125
-                    else:
-                        color = self.cmap[
-                            int(
-                                (255 / (self.maxTp - self.minTp)) * (tpVal - self.minTp)
-                            )
-                        ]
-                self.paramap[point[0], point[1], point[2]] = [
-                    int(color[2] * 255),
-                    int(color[1] * 255),
-                    int(color[0] * 255),
-                    int(self.curAlpha),
-                ]
-
-            self.updateCrosshairs()
-
-    def displayMtt(self):
-        if not self.mttParamapButton.isChecked():
-            self.clearParamap()
+    def paintParamap(self, paramVals, minVal, maxVal):
+        points = np.asarray(self.interpolatedPoints)
+        xs, ys, zs = points[:, 0], points[:, 1], points[:, 2]
+        cmap = np.asarray(self.cmap)
+        if maxVal == minVal:
+            pointColors = np.repeat(cmap[125][None], len(points), axis=0)
         else:
-            if self.aucParamapButton.isChecked():
-                self.aucParamapButton.setChecked(False)
-            if self.tpParamapButton.isChecked():
-                self.tpParamapButton.setChecked(False)
-            if self.peParamapButton.isChecked():
-                self.peParamapButton.setChecked(False)
-
-            self.cmap = plt.get_cmap("cividis").colors
-
-            arr = np.linspace(0, 100, 1000).reshape((1000, 1))
-            self.legendDisplay.ax.clear()
-            new_cmap1 = self.legendDisplay.truncate_colormap(plt.get_cmap("cividis"))
-            self.legendDisplay.ax.imshow(
-                arr, aspect="auto", cmap=new_cmap1, origin="lower"
-            )
-            self.legendDisplay.legendLabel.setText("Parametric Map\nLegend:")
-            self.legendDisplay.ax.tick_params(axis="y", labelsize=7, pad=0.5)
-            self.legendDisplay.ax.set_xticks([])
-            self.legendDisplay.ax.set_yticks([0, 250, 500, 750, 1000])
-            self.legendDisplay.ax.set_yticklabels(
-                [
-                    np.round(self.minMtt, decimals=1),
-                    np.round(
-                        self.minMtt + ((self.maxMtt - self.minMtt) / 4), decimals=1
-                    ),
-                    np.round(
-                        self.minMtt + ((self.maxMtt - self.minMtt) / 4), decimals=1
-                    ),
-                    np.round(
-                        self.minMtt + (3 * (self.maxMtt - self.minMtt) / 4), decimals=1
-                    ),
-                    np.round(self.maxMtt, decimals=1),
-                ]
-            )
-            self.legendDisplay.figure.subplots_adjust(
-                left=0.4, right=0.95, bottom=0.05, top=0.96
-            )
-            self.legendDisplay.canvas.draw()
-            self.legendDisplay.legendFrame.setHidden(False)
-
-            for point in self.interpolatedPoints:
-                if self.maxMtt == self.minMtt:
-                    color = self.cmap[125]
-                else:
-                    mttVal = self.masterParamap[point[0], point[1], point[2], 2]
-                    if not self.masterParamap[point[0], point[1], point[2], 3]:
-                        color = [0, 0, 0]  # window not able to be fit
-                    elif self.maxMtt == self.minMtt:
-                        color = self.cmap[125]
-                    else:
-                        color = self.cmap[
-                            int(
-                                (255 / (self.maxMtt - self.minMtt))
-                                * (mttVal - self.minMtt)
-                            )
-                        ]
-                self.paramap[point[0], point[1], point[2]] = [
-                    int(color[2] * 255),
-                    int(color[1] * 255),
-                    int(color[0] * 255),
-                    int(self.curAlpha),
-                ]
-
-            self.updateCrosshairs()
+            norm = Normalize(vmin=minVal, vmax=maxVal, clip=True)
+            pointColors = cmap[(255 * norm(paramVals[xs, ys, zs])).astype(int)]
+            pointColors[self.masterParamap[xs, ys, zs, 3] == 0] = 0  # window not able to be fit
+        self.paramap[xs, ys, zs, :3] = (pointColors[:, ::-1] * 255).astype(int)
+        self.paramap[xs, ys, zs, 3] = int(self.curAlpha)
 
     def loadParamaps(self):
         fileName, _ = QFileDialog.getOpenFileName(
@@ -498,127 +301,15 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
             )
         )
 
-        self.maxAuc = 0
-        self.minAuc = 99999999
-        self.maxPe = 0
-        self.minPe = 99999999
-        self.maxTp = 0
-        self.minTp = 99999999
-        self.maxMtt = 0
-        self.minMtt = 99999999
-        for i in range(len(self.interpolatedPoints)):
-            if (
-                self.masterParamap[
-                    self.interpolatedPoints[i][0],
-                    self.interpolatedPoints[i][1],
-                    self.interpolatedPoints[i][2],
-                ][3]
-                != 0
-            ):
-                if (
-                    self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][0]
-                    > self.maxAuc
-                ):
-                    self.maxAuc = self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][0]
-                if (
-                    self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][0]
-                    < self.minAuc
-                ):
-                    self.minAuc = self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][0]
-                if (
-                    self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][1]
-                    > self.maxPe
-                ):
-                    self.maxPe = self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][1]
-                if (
-                    self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][1]
-                    < self.minPe
-                ):
-                    self.minPe = self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][1]
-                if (
-                    self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][2]
-                    > self.maxTp
-                ):
-                    self.maxTp = self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][2]
-                if (
-                    self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][2]
-                    < self.minTp
-                ):
-                    self.minTp = self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][2]
-                if (
-                    self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][3]
-                    > self.maxMtt
-                ):
-                    self.maxMtt = self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][3]
-                if (
-                    self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][3]
-                    < self.minMtt
-                ):
-                    self.minMtt = self.masterParamap[
-                        self.interpolatedPoints[i][0],
-                        self.interpolatedPoints[i][1],
-                        self.interpolatedPoints[i][2],
-                    ][3]
+        points = np.asarray(self.interpolatedPoints)
+        voiParams = self.masterParamap[points[:, 0], points[:, 1], points[:, 2], :4]
+        fitParams = voiParams[voiParams[:, 3] != 0]
+        minVals = fitParams.min(axis=0, initial=99999999)
+        maxVals = fitParams.max(axis=0, initial=0)
+        self.paramapRanges = {
+            name: (minVals[channel], maxVals[channel])
+            for name, (_, _, channel, _) in paramapDisplays.items()
+        }
 
         self.hideResultsViewLayout(); self.showParamapDisplayLayout()
 
@@ -641,6 +332,10 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
             self.sagPlane.setCursor(QCursor(Qt.CursorShape.ArrowCursor))
             self.corPlane.setCursor(QCursor(Qt.CursorShape.ArrowCursor))
 
+    def scheduleCrosshairs(self):
+        if not self.crosshairTimer.isActive():
+            self.crosshairTimer.start()
+
     def updateCrosshairs(self):
         self.changeAxialSlices(); self.changeSagSlices(); self.changeCorSlices()
         xCoordAx = int((self.newXVal/self.x) * self.axialPlane.pixmap().width())
@@ -687,6 +382,7 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         self.hide()
 
     def backToLastScreen(self):
+        self.lastGui.bmode4dImg = self.bmode4dImg
         self.lastGui.show()
         self.lastGui.resize(self.size())
         self.hide()
@@ -706,6 +402,7 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         self.newData = None
         self.interpolatedPoints = self.lastGui.interpolatedPoints[0]
         self.ceus4dImg = self.lastGui.ceus4dImg
+        self.bmodeNibImg = self.lastGui.bmodeNibImg
         self.bmode4dImg = self.lastGui.bmode4dImg
         self.curSliceIndex = self.lastGui.curSliceIndex
         self.newXVal = self.lastGui.newXVal
@@ -720,7 +417,7 @@ class CeusAnalysisGUI(Ui_ceusAnalysis, QWidget):
         self.curSliceTotal.setText(str(self.sliceArray[-1]))
         self.data4dImg = self.lastGui.data4dImg
         
-        if self.bmode4dImg is None:
+        if self.bmodeNibImg is None:
             self.toggleButton.hide()
         elif self.lastGui.toggleButton.isChecked():
             self.toggleButton.setChecked(True)
@@ -2,16 +2,15 @@ import platform
 
 import numpy as np
 import matplotlib.pyplot as plt
-from PIL.ImageQt import ImageQt
 from matplotlib.widgets import RectangleSelector
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from PyQt6.QtWidgets import QWidget, QApplication, QHBoxLayout
 from PyQt6.QtGui import QPixmap, QPainter, QImage, QCursor, QResizeEvent
-from PyQt6.QtCore import QLine, Qt, QPoint, pyqtSlot
+from PyQt6.QtCore import QLine, Qt, QPoint, QTimer, pyqtSlot
 
 from src.CeusTool3d.ticAnalysis_ui import Ui_ticEditor
 from src.CeusTool3d.ceusAnalysis_ui_helper import CeusAnalysisGUI
-from src.Utils.qtSupport import MouseTracker, qImToPIL
+from src.Utils.qtSupport import MouseTracker, loadBmode, overlayMask
 
 system = platform.system()
 
@@ -99,7 +98,7 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
         self.newXVal = None; self.newYVal = None; self.newZVal = None
         self.maskCoverImg = None; self.sliceArray = None; self.voxelScale = None
         self.x = None; self.y = None; self.z = None
-        self.bmode4dImg = None; self.ceus4dImg = None
+        self.bmode4dImg = None; self.bmodeNibImg = None; self.ceus4dImg = None
         self.lastGui = None; self.prevLine = None; self.timeLine = None
         self.selectedPoints = []; self.frontPointsX = []; self.frontPointsY = []
         self.removedPointsX = []; self.removedPointsY = []
@@ -113,6 +112,8 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
         self.horizLayout.addWidget(self.canvas)
         self.canvas.draw()
         self.ax = self.fig.add_subplot(111)
+        self.t0Background = None
+        self.canvas.mpl_connect("draw_event", self.cacheT0Background)
 
         self.selectT0Button.clicked.connect(self.initT0)
         self.automaticallySelectT0Button.clicked.connect(self.deferAutomaticT0)
@@ -130,9 +131,15 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
         trackerCor.positionChanged.connect(self.corCoordChanged)
         trackerCor.positionClicked.connect(self.planeClicked)
 
+        # Mouse tracking fires far faster than the three planes can be repainted
+        self.crosshairTimer = QTimer(self)
+        self.crosshairTimer.setSingleShot(True)
+        self.crosshairTimer.setInterval(33)
+        self.crosshairTimer.timeout.connect(self.updateCrosshairs)
+
     def toggleIms(self):
         if self.toggleButton.isChecked():
-            self.data4dImg = self.bmode4dImg
+            self.data4dImg = loadBmode(self)
         else:
             self.data4dImg = self.ceus4dImg
         self.updateCrosshairs()
@@ -160,9 +167,11 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
 
             if xCoord < 0 or yCoord < 0 or xCoord >= self.axialPlane.pixmap().width() or yCoord >= self.axialPlane.pixmap().height():
                 return
-            self.newXVal = int((xCoord/self.axialPlane.pixmap().width()) * self.x)
-            self.newYVal = int((yCoord/self.axialPlane.pixmap().height()) * self.y)
-            self.updateCrosshairs()
+            newXVal = int((xCoord/self.axialPlane.pixmap().width()) * self.x)
+            newYVal = int((yCoord/self.axialPlane.pixmap().height()) * self.y)
+            if (newXVal, newYVal) != (self.newXVal, self.newYVal):
+                self.newXVal, self.newYVal = newXVal, newYVal
+                self.scheduleCrosshairs()
 
     @pyqtSlot(QPoint)
     def sagCoordChanged(self, pos):
@@ -173,9 +182,11 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
 
             if xCoord < 0 or yCoord < 0 or xCoord >= self.sagPlane.pixmap().width() or yCoord >= self.sagPlane.pixmap().height():
                 return
-            self.newZVal = int((xCoord/self.sagPlane.pixmap().width()) * self.z)
-            self.newYVal = int((yCoord/self.sagPlane.pixmap().height()) * self.y)
-            self.updateCrosshairs()
+            newZVal = int((xCoord/self.sagPlane.pixmap().width()) * self.z)
+            newYVal = int((yCoord/self.sagPlane.pixmap().height()) * self.y)
+            if (newZVal, newYVal) != (self.newZVal, self.newYVal):
+                self.newZVal, self.newYVal = newZVal, newYVal
+                self.scheduleCrosshairs()
         
     @pyqtSlot(QPoint)
     def corCoordChanged(self, pos):
@@ -186,11 +197,14 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
 
             if xCoord < 0 or yCoord < 0 or xCoord >= self.corPlane.pixmap().width() or yCoord >= self.corPlane.pixmap().height():
                 return
-            self.newXVal = int((xCoord/self.corPlane.pixmap().width()) * self.x)
-            self.newZVal = int((yCoord/self.corPlane.pixmap().height()) * self.z)
-            self.updateCrosshairs()
+            newXVal = int((xCoord/self.corPlane.pixmap().width()) * self.x)
+            newZVal = int((yCoord/self.corPlane.pixmap().height()) * self.z)
+            if (newXVal, newZVal) != (self.newXVal, self.newZVal):
+                self.newXVal, self.newZVal = newXVal, newZVal
+                self.scheduleCrosshairs()
 
     def backToLastScreen(self):
+        self.lastGui.bmode4dImg = self.bmode4dImg
         self.lastGui.show()
         self.lastGui.resize(self.size())
         self.hide()
@@ -231,7 +245,8 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
             self.prevLine.remove()
             self.t0Index = -2
         self.prevLine = self.ax.axvline(
-            x=self.t0Slider.value(), color="green", label="axvline - full height"
+            x=self.t0Slider.value(), color="green", label="axvline - full height",
+            animated=True,
         )
         self.canvas.draw()
         try:
@@ -295,13 +310,18 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
 
         self.canvas.draw()
 
+    def cacheT0Background(self, event):
+        # t0 line is animated, so full draws leave it out of the cached background
+        if self.prevLine is not None and not self.t0Slider.isHidden():
+            self.t0Background = self.canvas.copy_from_bbox(self.ax.bbox)
+            self.ax.draw_artist(self.prevLine)
+
     def t0ScrollValueChanged(self):
-        self.prevLine.remove()
-        self.prevLine = self.ax.axvline(
-            x=self.t0Slider.value(), color="green", label="axvline - full height"
-        )
+        self.prevLine.set_xdata([self.t0Slider.value(), self.t0Slider.value()])
         self.sliceValueChanged()
-        self.canvas.draw()
+        self.canvas.restore_region(self.t0Background)
+        self.ax.draw_artist(self.prevLine)
+        self.canvas.blit(self.ax.bbox)
 
     def removeSelectedPoints(self):
         if len(self.selectedPoints):
@@ -336,10 +356,8 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
         self.acceptTicButton.setHidden(False)
 
         if self.t0Index == -2:
-            for i in range(len(self.ticX[:, 0])):
-                if self.ticX[:, 0][i] > self.t0Slider.value():
-                    break
-            self.t0Index = i
+            afterT0 = np.flatnonzero(self.ticX[:, 0] > self.t0Slider.value())
+            self.t0Index = int(afterT0[0]) if len(afterT0) else len(self.ticX) - 1
 
         self.selectedPoints = list(range(self.t0Index))
         if len(self.selectedPoints):
@@ -356,11 +374,9 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
         self.mask |= self.inside(event1, event2)
         x = self.ticX[:, 0][self.mask]
         y = self.ticY[self.mask]
-        addedIndices = np.sort(np.array(list(range(len(self.ticY))))[self.mask])
-        for index in addedIndices:
-            self.selectedPoints.append(index)
+        self.selectedPoints.extend(np.flatnonzero(self.mask).tolist())
         self.ax.scatter(x, y, color="orange")
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
     def inside(self, event1, event2):
         # Returns a boolean mask of the points inside the rectangle defined by
@@ -380,7 +396,7 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
             lastPt = self.selectedPoints[-1]
             self.selectedPoints.pop()
             self.ax.scatter(self.ticX[lastPt][0], self.ticY[lastPt], color="red")
-            self.canvas.draw()
+            self.canvas.draw_idle()
             self.mask = np.zeros(self.ticX[:, 0].shape, dtype=bool)
 
     def restoreLastPoints(self):
@@ -424,88 +440,56 @@ class TicAnalysisGUI(Ui_ticEditor, QWidget):
             thisline = event.artist
             xdata = thisline.get_xdata()
             ind = event.ind[0]
-            if self.timeLine is not None:
-                self.timeLine.remove()
-            self.timeLine = self.ax.axvline(
-                x=xdata[ind],
-                color=(0, 0, 1, 0.3),
-                label="axvline - full height",
-                zorder=1,
-            )
+            if self.timeLine is None:
+                self.timeLine = self.ax.axvline(
+                    x=xdata[ind],
+                    color=(0, 0, 1, 0.3),
+                    label="axvline - full height",
+                    zorder=1,
+                )
+            else:
+                self.timeLine.set_xdata([xdata[ind], xdata[ind]])
             self.curSliceIndex = self.findSliceFromTime(xdata[ind])
-            self.canvas.draw()
+            self.canvas.draw_idle()
             self.updateCrosshairs()
 
     def changeAxialSlices(self):
-        data2dAx = self.data4dImg[:, :, self.newZVal, self.curSliceIndex]
-        data2dAx = np.rot90(np.flipud(data2dAx), 3)  # rotate
-        data2dAx = np.require(data2dAx, np.uint8, "C")
-        heightAx, widthAx = data2dAx.shape
-        bytesLineAx, _ = data2dAx.strides
-        
-        qImgAx = QImage(data2dAx, widthAx, heightAx, bytesLineAx, QImage.Format.Format_Grayscale8)
-        qImgAx = qImgAx.convertToFormat(QImage.Format.Format_ARGB32)
-
-        tempAx = self.maskCoverImg[:, :, self.newZVal, :]  # 2D data for axial
-        tempAx = np.rot90(np.flipud(tempAx), 3)  # rotate ccw 270
-        tempAx = np.require(tempAx, np.uint8, "C")
-        maskAxH, maskAxW = tempAx[:, :, 0].shape
-        maskBytesLineAx, _ = tempAx[:, :, 0].strides
+        data2dAx = self.data4dImg[:, :, self.newZVal, self.curSliceIndex].T
+        tempAx = self.maskCoverImg[:, :, self.newZVal, :].transpose(1, 0, 2)  # 2D data for axial
+        imAx = overlayMask(data2dAx, tempAx)
+        heightAx, widthAx = imAx.shape[:2]
 
-        curMaskAxIm = QImage(tempAx, maskAxW, maskAxH, maskBytesLineAx, QImage.Format.Format_ARGB32)
-
-        imAxPIL = qImToPIL(qImgAx); maskAx = qImToPIL(curMaskAxIm)
-        imAxPIL.paste(maskAx, mask=maskAx)
-        pixmapAx = QPixmap.fromImage(ImageQt(imAxPIL))
+        qImgAx = QImage(imAx, widthAx, heightAx, imAx.strides[0], QImage.Format.Format_ARGB32)
+        pixmapAx = QPixmap.fromImage(qImgAx)
         self.axialPlane.setPixmap(pixmapAx.scaled(
             self.axialPlane.width(), self.axialPlane.height(), Qt.AspectRatioMode.KeepAspectRatio))
 
     def changeSagSlices(self):
         data2dSag = self.data4dImg[self.newXVal, :, :, self.curSliceIndex]
-        data2dSag = np.require(data2dSag, np.uint8, "C")
-        heightSag, widthSag = data2dSag.shape
-        bytesLineSag, _ = data2dSag.strides
-
-        qImgSag = QImage(data2dSag, widthSag, heightSag, bytesLineSag, QImage.Format.Format_Grayscale8)
-        qImgSag = qImgSag.convertToFormat(QImage.Format.Format_ARGB32)
-
         tempSag = self.maskCoverImg[self.newXVal, :, :, :]
-        tempSag = np.require(tempSag, np.uint8, "C")
-        maskSagH, maskSagW = tempSag[:, :, 0].shape
-        maskBytesLineSag, _ = tempSag[:, :, 0].strides
-
-        curMaskSagIm = QImage(tempSag, maskSagW, maskSagH, maskBytesLineSag, QImage.Format.Format_ARGB32)
+        imSag = overlayMask(data2dSag, tempSag)
+        heightSag, widthSag = imSag.shape[:2]
 
-        imSagPIL = qImToPIL(qImgSag); maskSag = qImToPIL(curMaskSagIm)
-        imSagPIL.paste(maskSag, mask=maskSag)
-        pixmapSag = QPixmap.fromImage(ImageQt(imSagPIL))
+        qImgSag = QImage(imSag, widthSag, heightSag, imSag.strides[0], QImage.Format.Format_ARGB32)
+        pixmapSag = QPixmap.fromImage(qImgSag)
         self.sagPlane.setPixmap(pixmapSag.scaled(
             self.sagPlane.width(), self.sagPlane.height(), Qt.AspectRatioMode.KeepAspectRatio))
 
     def changeCorSlices(self):
-        data2dCor = self.data4dImg[:, self.newYVal, :, self.curSliceIndex]
-        data2dCor = np.fliplr(np.rot90(data2dCor, 3))
-        data2dCor = np.require(data2dCor, np.uint8, "C")
-        heightCor, widthCor = data2dCor.shape
-        bytesLineCor, _ = data2dCor.strides
-
-        qImgCor = QImage(data2dCor, widthCor, heightCor, bytesLineCor, QImage.Format.Format_Grayscale8)
-        qImgCor = qImgCor.convertToFormat(QImage.Format.Format_ARGB32)
-
-        tempCor = self.maskCoverImg[:, self.newYVal, :, :]
-        tempCor = np.fliplr(np.rot90(tempCor, 3))
-        tempCor = np.require(tempCor, np.uint8, "C")
-        maskCorH, maskCorW = tempCor[:, :, 0].shape
-        maskBytesLineCor, _ = tempCor[:, :, 0].strides
-
-        curMaskCorIm = QImage(tempCor, maskCorW,maskCorH, maskBytesLineCor, QImage.Format.Format_ARGB32)
-
-        imCorPIL = qImToPIL(qImgCor); maskCor = qImToPIL(curMaskCorIm)
-        imCorPIL.paste(maskCor, mask=maskCor)
-        pixmapCor = QPixmap.fromImage(ImageQt(imCorPIL))
+        data2dCor = self.data4dImg[:, self.newYVal, :, self.curSliceIndex].T
+        tempCor = self.maskCoverImg[:, self.newYVal, :, :].transpose(1, 0, 2)
+        imCor = overlayMask(data2dCor, tempCor)
+        heightCor, widthCor = imCor.shape[:2]
+
+        qImgCor = QImage(imCor, widthCor, heightCor, imCor.strides[0], QImage.Format.Format_ARGB32)
+        pixmapCor = QPixmap.fromImage(qImgCor)
         self.corPlane.setPixmap(pixmapCor.scaled(
             self.corPlane.width(), self.corPlane.height(), Qt.AspectRatioMode.KeepAspectRatio))
         
+    def scheduleCrosshairs(self):
+        if not self.crosshairTimer.isActive():
+            self.crosshairTimer.start()
+
     def updateCrosshairs(self):
         self.changeAxialSlices(); self.changeSagSlices(); self.changeCorSlices()
         xCoordAx = int((self.newXVal/self.x) * self.axialPlane.pixmap().width())
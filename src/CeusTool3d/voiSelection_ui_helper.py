@@ -4,7 +4,6 @@ from pathlib import Path
 from itertools import chain
 from contextlib import suppress
 
-from PIL.ImageQt import ImageQt
 import nibabel as nib
 import numpy as np
 import scipy.interpolate as interpolate
@@ -20,11 +19,17 @@ from src.CeusTool3d.saveVoi_ui_helper import SaveVoiGUI
 from src.CeusTool3d.ticAnalysis_ui_helper import TicAnalysisGUI
 from src.CeusTool3d.interpolationLoading_ui_helper import InterpolationLoadingGUI
 from src.CeusTool3d.advancedRoi_ui_helper import AdvancedRoiDrawGUI
-from src.Utils.qtSupport import MouseTracker, qImToPIL
+from src.Utils.qtSupport import MouseTracker, loadBmode, overlayMask
 from src.Utils.spline import calculateSpline3D, calculateSpline, removeDuplicates
 
 system = platform.system()
 
+
+def paintVoxels(mask, points, color):
+    points = np.asarray(points, dtype=int).reshape(-1, 3)
+    mask[points[:, 0], points[:, 1], points[:, 2]] = color
+
+
 class VoiSelectionGUI(Ui_constructVoi, QWidget):
     def __init__(self):
         # self.selectImage = QWidget()
@@ -121,6 +126,7 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
         self.tmppv = None
         self.fullPath = None
         self.bmode4dImg = None
+        self.bmodeNibImg = None
         self.curSliceIndex = 0
         self.curAlpha = 255
         self.curPointsPlottedX = []; self.curPointsPlottedY = []
@@ -133,6 +139,7 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
         self.drawingNeg = False
 
         self.ticAnalysisGui = None
+        self.overlayBuffers = {}
         self.loadingGUI = InterpolationLoadingGUI()
         self.advancedRoiDrawGui = AdvancedRoiDrawGUI()
         
@@ -169,7 +176,7 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
         pointsPlottedX, pointsPlottedY = self.pointsPlotted[planeIdx]
 
         data2dAx = self.data4dImg[:, :, closestAxDrawing[0], closestAxDrawing[1]]
-        data2dAx = np.rot90(np.flipud(data2dAx), 3)
+        data2dAx = data2dAx.T
         data2dAx = np.require(data2dAx, np.uint8, "C")
         self.newZVal = closestAxDrawing[0]; 
         self.curSliceSlider.setValue(closestAxDrawing[1])
@@ -202,7 +209,7 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
         pointsPlottedX, pointsPlottedY = self.pointsPlotted[planeIdx]
 
         data2dCor = self.data4dImg[:, closestCorDrawing[0], :, closestCorDrawing[1]]
-        data2dCor = np.fliplr(np.rot90(data2dCor, 3))
+        data2dCor = data2dCor.T
         data2dCor = np.require(data2dCor, np.uint8, "C")
         self.newYVal = closestCorDrawing[0]; 
         self.curSliceSlider.setValue(closestCorDrawing[1]) 
@@ -250,12 +257,12 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
         self.saveVoiGUI.show()
 
     def saveVoi(self, fileDestination, name, frame):
-        segMask = np.zeros([self.x + 1, self.y + 1, self.z + 1, self.numSlices])
-        for point in self.interpolatedPoints[0]:
-            segMask[point[0], point[1], point[2], frame] = 1
+        segMask = np.zeros([self.x + 1, self.y + 1, self.z + 1, self.numSlices], dtype=np.uint8)
+        points = np.asarray(self.interpolatedPoints[0]).reshape(-1, 3)
+        segMask[points[:, 0], points[:, 1], points[:, 2], frame] = 1
 
         affine = np.eye(4)
-        niiarray = nib.Nifti1Image(segMask.astype("uint8"), affine)
+        niiarray = nib.Nifti1Image(segMask, affine)
         niiarray.header["descrip"] = self.imagePathInput.text()
         outputPath = os.path.join(fileDestination, name)
         if os.path.exists(outputPath):
@@ -276,13 +283,11 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
                 return
         else:
             return
-        maskPoints = np.where(mask > 0)
-        maskPoints = np.transpose(maskPoints)
-        for point in maskPoints:
-            self.maskCoverImg[point[0], point[1], point[2]] = [0, 0, 255, int(self.curAlpha)]
+        maskPoints = np.nonzero(mask)
+        self.maskCoverImg[maskPoints[:3]] = [0, 0, 255, int(self.curAlpha)]
         
         self.interpolatedPoints = [np.transpose(np.where(self.maskCoverImg[:,:,:,2] == 255))]
-        self.curFrameIndex = maskPoints[0, 0]
+        self.curFrameIndex = maskPoints[0][0]
 
         self.hideVoiApproachLayout()
         self.showVoiDecisionLayout()
@@ -337,7 +342,7 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
         self.backFromDraw()
 
     def computeTic(self):
-        times = [i * self.timeconst for i in range(1, self.ceus4dImg.shape[3] + 1)]
+        times = np.arange(1, self.ceus4dImg.shape[3] + 1) * self.timeconst
         self.voxelScale = (
             self.header[1] * self.header[2] * self.header[3]
         )  # /1000/1000/1000 # mm^3
@@ -371,7 +376,7 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
     def setFilenameDisplays(self, imageName):
         self.imagePathInput.setHidden(False)
 
-        imFile = imageName.split("/")[-1]
+        imFile = os.path.basename(imageName)
         self.fullPath = imageName
 
         self.imagePathInput.setText(imFile)
@@ -388,12 +393,15 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
             self.sliceValueChanged()
 
     def findSliceFromTime(self, inputtedTime):
-        i = 0
-        while i < len(self.sliceArray):
-            if inputtedTime < self.sliceArray[i]:
-                break
+        # Slice times are (rounded) multiples of timeconst, so divide for the first time past
+        # inputtedTime and only step to absorb the rounding
+        n = len(self.sliceArray)
+        i = min(max(int(inputtedTime / self.timeconst), 0), n)
+        while i < n and self.sliceArray[i] <= inputtedTime:
             i += 1
-        if i == len(self.sliceArray):
+        while i > 0 and self.sliceArray[i - 1] > inputtedTime:
+            i -= 1
+        if i == n:
             i -= 1
         elif i > 0:
             if (self.sliceArray[i] - inputtedTime) > (
@@ -424,29 +432,20 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
         self.curAlpha = int(self.voiAlphaSpinBox.value())
         self.voiAlphaSpinBoxChanged = False
         self.voiAlphaStatus.setValue(self.curAlpha)
-        for i in range(len(self.interpolatedPoints)):
-            for j in range(len(self.interpolatedPoints[i])):
-                self.maskCoverImg[
-                    self.interpolatedPoints[i][j][0],
-                    self.interpolatedPoints[i][j][1],
-                    self.interpolatedPoints[i][j][2],
-                    3,
-                ] = self.curAlpha
+        for points in self.interpolatedPoints:
+            points = np.asarray(points, dtype=int).reshape(-1, 3)
+            self.maskCoverImg[points[:, 0], points[:, 1], points[:, 2], 3] = self.curAlpha
         self.updateCrosshairs()
 
     def toggleIms(self):
         if self.toggleButton.isChecked():
-            self.data4dImg = self.bmode4dImg
+            self.data4dImg = loadBmode(self)
         else:
             self.data4dImg = self.ceus4dImg
         self.updateCrosshairs()
 
     def showHideCross(self):
         if self.showHideCrossButton.isChecked():
-            pilIms = [self.imAxPIL, self.imSagPIL, self.imCorPIL]
-            pixmaps = [self.pixmapAx, self.pixmapSag, self.pixmapCor]
-            for i, pilIm in enumerate(pilIms):
-                pixmaps[i] = QPixmap.fromImage(ImageQt(pilIm))
             self.changeAxialSlices(); self.changeSagSlices(); self.changeCorSlices()
             self.axialPlane.setCursor(QCursor(Qt.CursorShape.ArrowCursor))
             self.sagPlane.setCursor(QCursor(Qt.CursorShape.ArrowCursor))
@@ -459,24 +458,25 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
             self.updateCrosshairs()
 
     def openImage(self, bmodePath):
-        self.nibImg = nib.load(self.inputTextPath, mmap=False)
-        dataNibImg = self.nibImg.get_fdata()
-        
-        dataNibImg = dataNibImg.astype(np.uint8)
-        self.ceus4dImg = dataNibImg.copy()
+        self.nibImg = nib.load(self.inputTextPath)
+        # Read through the array proxy so uint8 volumes never pass through a float64 copy
+        dataNibImg = np.asanyarray(self.nibImg.dataobj).astype(np.uint8, copy=False)
+        # Volumes are only ever sliced for display and toggleIms swaps references, so alias instead of copying
+        self.ceus4dImg = dataNibImg
 
         self.data4dImg = dataNibImg
         self.x, self.y, self.z, self.numSlices = self.data4dImg.shape
-        self.maskCoverImg = np.zeros([self.x, self.y, self.z, 4])
+        self.maskCoverImg = np.zeros([self.x, self.y, self.z, 4], dtype=np.uint8)
         self.curSliceSlider.setMaximum(self.numSlices - 1)
 
         if bmodePath is not None:
-            self.bmode4dImg = nib.load(bmodePath, mmap=False).get_fdata().astype(np.uint8)
+            # Only the header is read here; the volume is loaded the first time it's needed
+            self.bmodeNibImg = nib.load(bmodePath)
             self.toggleButton.show()
 
         self.header = self.nibImg.header["pixdim"]  # [dims, voxel dims (3 vals), timeconst, 0, 0, 0], assume mm/pix
         self.sliceArray = np.round(
-            [i * self.timeconst for i in range(1, self.ceus4dImg.shape[3] + 1)],
+            np.arange(1, self.ceus4dImg.shape[3] + 1) * self.timeconst,
             decimals=2,
         )
         self.curSliceSpinBox.setMaximum(self.sliceArray[-1])
@@ -528,15 +528,20 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
     @pyqtSlot(QPoint)
     def axCoordChanged(self, pos):
         if not self.scrollPaused and ((self.observingLabel.isHidden() and self.painted == "none") or self.painted == "ax"):
-            xdiff = self.axialPlane.width() - self.axialPlane.pixmap().width()
-            ydiff = self.axialPlane.height() - self.axialPlane.pixmap().height()
+            width, height = self.basePixmapAx.width(), self.basePixmapAx.height()
+            xdiff = self.axialPlane.width() - width
+            ydiff = self.axialPlane.height() - height
             xCoord = pos.x() - xdiff/2; yCoord = pos.y() - ydiff/2
 
-            if xCoord < 0 or yCoord < 0 or xCoord >= self.axialPlane.pixmap().width() or yCoord >= self.axialPlane.pixmap().height():
+            if xCoord < 0 or yCoord < 0 or xCoord >= width or yCoord >= height:
                 return
-            self.newXVal = int((xCoord/self.axialPlane.pixmap().width()) * self.x)
-            self.newYVal = int((yCoord/self.axialPlane.pixmap().height()) * self.y)
-            self.updateCrosshairs()
+            newXVal = int((xCoord/width) * self.x)
+            newYVal = int((yCoord/height) * self.y)
+            if (newXVal, newYVal) == (self.newXVal, self.newYVal):
+                return  # still inside the voxel already on screen
+            self.newXVal, self.newYVal = newXVal, newYVal
+            self.changeSagSlices(); self.changeCorSlices()
+            self.drawCrosshairs()
 
     @pyqtSlot(QPoint)
     def sagPlaneClicked(self, pos):
@@ -558,15 +563,20 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
     @pyqtSlot(QPoint)
     def sagCoordChanged(self, pos):
         if not self.scrollPaused and ((self.observingLabel.isHidden() and self.painted == "none") or self.painted == "sag"):
-            xdiff = self.sagPlane.width() - self.sagPlane.pixmap().width()
-            ydiff = self.sagPlane.height() - self.sagPlane.pixmap().height()
+            width, height = self.basePixmapSag.width(), self.basePixmapSag.height()
+            xdiff = self.sagPlane.width() - width
+            ydiff = self.sagPlane.height() - height
             xCoord = pos.x() - xdiff/2; yCoord = pos.y() - ydiff/2
 
-            if xCoord < 0 or yCoord < 0 or xCoord >= self.sagPlane.pixmap().width() or yCoord >= self.sagPlane.pixmap().height():
+            if xCoord < 0 or yCoord < 0 or xCoord >= width or yCoord >= height:
                 return
-            self.newZVal = int((xCoord/self.sagPlane.pixmap().width()) * self.z)
-            self.newYVal = int((yCoord/self.sagPlane.pixmap().height()) * self.y)
-            self.updateCrosshairs()
+            newZVal = int((xCoord/width) * self.z)
+            newYVal = int((yCoord/height) * self.y)
+            if (newZVal, newYVal) == (self.newZVal, self.newYVal):
+                return  # still inside the voxel already on screen
+            self.newZVal, self.newYVal = newZVal, newYVal
+            self.changeAxialSlices(); self.changeCorSlices()
+            self.drawCrosshairs()
 
     @pyqtSlot(QPoint)
     def corPlaneClicked(self, pos):
@@ -588,34 +598,47 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
     @pyqtSlot(QPoint)
     def corCoordChanged(self, pos):
         if not self.scrollPaused and ((self.observingLabel.isHidden() and self.painted == "none") or self.painted == "cor"):
-            xdiff = self.corPlane.width() - self.corPlane.pixmap().width()
-            ydiff = self.corPlane.height() - self.corPlane.pixmap().height()
+            width, height = self.basePixmapCor.width(), self.basePixmapCor.height()
+            xdiff = self.corPlane.width() - width
+            ydiff = self.corPlane.height() - height
             xCoord = pos.x() - xdiff/2; yCoord = pos.y() - ydiff/2
 
-            if xCoord < 0 or yCoord < 0 or xCoord >= self.corPlane.pixmap().width() or yCoord >= self.corPlane.pixmap().height():
+            if xCoord < 0 or yCoord < 0 or xCoord >= width or yCoord >= height:
                 return
-            self.newXVal = int((xCoord/self.corPlane.pixmap().width()) * self.x)
-            self.newZVal = int((yCoord/self.corPlane.pixmap().height()) * self.z)
-            self.updateCrosshairs()
+            newXVal = int((xCoord/width) * self.x)
+            newZVal = int((yCoord/height) * self.z)
+            if (newXVal, newZVal) == (self.newXVal, self.newZVal):
+                return  # still inside the voxel already on screen
+            self.newXVal, self.newZVal = newXVal, newZVal
+            self.changeAxialSlices(); self.changeSagSlices()
+            self.drawCrosshairs()
 
     def updateCrosshairs(self):
         self.updateAdvancedRoiEditButtons()
         self.changeAxialSlices(); self.changeSagSlices(); self.changeCorSlices()
-        xCoordAx = int((self.newXVal/self.x) * self.axialPlane.pixmap().width())
-        yCoordAx = int((self.newYVal/self.y) * self.axialPlane.pixmap().height())
-        xCoordSag = int((self.newZVal/self.z) * self.sagPlane.pixmap().width())
-        yCoordSag = int((self.newYVal/self.y) * self.sagPlane.pixmap().height())
-        xCoordCor = int((self.newXVal/self.x) * self.corPlane.pixmap().width())
-        yCoordCor = int((self.newZVal/self.z) * self.corPlane.pixmap().height())
+        self.drawCrosshairs()
+
+    def drawCrosshairs(self):
+        # Paints over the cached slice pixmaps, so a plane whose slice didn't move needn't be recomposited
+        axWidth, axHeight = self.basePixmapAx.width(), self.basePixmapAx.height()
+        sagWidth, sagHeight = self.basePixmapSag.width(), self.basePixmapSag.height()
+        corWidth, corHeight = self.basePixmapCor.width(), self.basePixmapCor.height()
+        xCoordAx = int((self.newXVal/self.x) * axWidth)
+        yCoordAx = int((self.newYVal/self.y) * axHeight)
+        xCoordSag = int((self.newZVal/self.z) * sagWidth)
+        yCoordSag = int((self.newYVal/self.y) * sagHeight)
+        xCoordCor = int((self.newXVal/self.x) * corWidth)
+        yCoordCor = int((self.newZVal/self.z) * corHeight)
 
         if not self.showHideCrossButton.isChecked():
-            pixmaps = [self.axialPlane.pixmap(), self.sagPlane.pixmap(), self.corPlane.pixmap()]
+            pixmaps = [self.basePixmapAx.copy(), self.basePixmapSag.copy(), self.basePixmapCor.copy()]
             points = [(xCoordAx, yCoordAx), (xCoordSag, yCoordSag), (xCoordCor, yCoordCor)]
+            sizes = [(axWidth, axHeight), (sagWidth, sagHeight), (corWidth, corHeight)]
             for i, pixmap in enumerate(pixmaps):
                 painter = QPainter(pixmap); painter.setPen(Qt.GlobalColor.yellow)
-                coord = points[i]
-                vertLine = QLine(coord[0], 0, coord[0], pixmap.height())
-                latLine = QLine(0, coord[1], pixmap.width(), coord[1])
+                coord = points[i]; width, height = sizes[i]
+                vertLine = QLine(coord[0], 0, coord[0], height)
+                latLine = QLine(0, coord[1], width, coord[1])
                 painter.drawLines([vertLine, latLine])
                 painter.end()
                 if i == 0:
@@ -685,81 +708,58 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
         self.corPlane.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.updateCrosshairs()
 
+    def planeBuffers(self, shape):
+        if shape not in self.overlayBuffers:
+            height, width = shape
+            self.overlayBuffers[shape] = (
+                np.empty((height, width, 1), dtype=np.uint16),
+                np.empty((height, width, 4), dtype=np.uint16),
+                np.empty((height, width, 4), dtype=np.uint16),
+                np.empty((height, width, 4), dtype=np.uint8),
+            )
+        return self.overlayBuffers[shape]
+
     def changeAxialSlices(self):
         self.axialFrameNum.setText(str(self.newZVal + 1))
 
-        data2dAx = self.data4dImg[:, :, self.newZVal, self.curSliceIndex]
-        data2dAx = np.rot90(np.flipud(data2dAx), 3)
-        data2dAx = np.require(data2dAx, np.uint8, "C")
-        heightAx, widthAx = data2dAx.shape  # getting height and width for each plane
-        bytesLineAx, _ = data2dAx.strides
-
-        qImgAx = QImage(data2dAx, widthAx, heightAx, bytesLineAx, QImage.Format.Format_Grayscale8)
-        qImgAx = qImgAx.convertToFormat(QImage.Format.Format_ARGB32)
-
-        tempAx = self.maskCoverImg[:, :, self.newZVal, :]  # 2D data for axial
-        tempAx = np.rot90(np.flipud(tempAx), 3)
-        tempAx = np.require(tempAx, np.uint8, "C")
-        maskAxH, maskAxW = tempAx[:, :, 0].shape
-        maskBytesLineAx, _ = tempAx[:, :, 0].strides
+        data2dAx = self.data4dImg[:, :, self.newZVal, self.curSliceIndex].T
+        tempAx = self.maskCoverImg[:, :, self.newZVal, :].transpose(1, 0, 2)  # 2D data for axial
+        imAx = overlayMask(data2dAx, tempAx, self.planeBuffers(data2dAx.shape))
+        heightAx, widthAx = imAx.shape[:2]  # getting height and width for each plane
 
-        curMaskAxIm = QImage(tempAx, maskAxW, maskAxH, maskBytesLineAx, QImage.Format.Format_ARGB32)
-
-        self.imAxPIL = qImToPIL(qImgAx); maskAx = qImToPIL(curMaskAxIm)
-        self.imAxPIL.paste(maskAx, mask=maskAx)
-        self.pixmapAx = QPixmap.fromImage(ImageQt(self.imAxPIL))
-        self.axialPlane.setPixmap(self.pixmapAx.scaled(
-            self.axialPlane.width(), self.axialPlane.height(), Qt.AspectRatioMode.KeepAspectRatio))
+        qImgAx = QImage(imAx, widthAx, heightAx, imAx.strides[0], QImage.Format.Format_ARGB32)
+        self.pixmapAx = QPixmap.fromImage(qImgAx)
+        self.basePixmapAx = self.pixmapAx.scaled(
+            self.axialPlane.width(), self.axialPlane.height(), Qt.AspectRatioMode.KeepAspectRatio)
+        self.axialPlane.setPixmap(self.basePixmapAx)
 
     def changeSagSlices(self):
         self.sagittalFrameNum.setText(str(self.newXVal + 1))
 
         data2dSag = self.data4dImg[self.newXVal, :, :, self.curSliceIndex]
-        data2dSag = np.require(data2dSag, np.uint8, "C")
-        heightSag, widthSag = data2dSag.shape
-        bytesLineSag, _ = data2dSag.strides
-        
-        qImgSag = QImage(data2dSag, widthSag, heightSag, bytesLineSag, QImage.Format.Format_Grayscale8)
-        qImgSag = qImgSag.convertToFormat(QImage.Format.Format_ARGB32)
-
         tempSag = self.maskCoverImg[self.newXVal, :, :, :]  # 2D data for sagittal
-        tempSag = np.require(tempSag, np.uint8, "C")
-        maskSagH, maskSagW = tempSag[:, :, 0].shape
-        maskBytesLineSag, _ = tempSag[:, :, 0].strides
+        imSag = overlayMask(data2dSag, tempSag, self.planeBuffers(data2dSag.shape))
+        heightSag, widthSag = imSag.shape[:2]
 
-        curMaskSagIm = QImage(tempSag, maskSagW, maskSagH, maskBytesLineSag, QImage.Format.Format_ARGB32)
-
-        self.imSagPIL = qImToPIL(qImgSag); maskSag = qImToPIL(curMaskSagIm)
-        self.imSagPIL.paste(maskSag, mask=maskSag)
-        self.pixmapSag = QPixmap.fromImage(ImageQt(self.imSagPIL))
-        self.sagPlane.setPixmap(self.pixmapSag.scaled(
-            self.sagPlane.width(), self.sagPlane.height(), Qt.AspectRatioMode.KeepAspectRatio))
+        qImgSag = QImage(imSag, widthSag, heightSag, imSag.strides[0], QImage.Format.Format_ARGB32)
+        self.pixmapSag = QPixmap.fromImage(qImgSag)
+        self.basePixmapSag = self.pixmapSag.scaled(
+            self.sagPlane.width(), self.sagPlane.height(), Qt.AspectRatioMode.KeepAspectRatio)
+        self.sagPlane.setPixmap(self.basePixmapSag)
 
     def changeCorSlices(self):
         self.coronalFrameNum.setText(str(self.newYVal + 1))
 
-        data2dCor = self.data4dImg[:, self.newYVal, :, self.curSliceIndex]
-        data2dCor = np.fliplr(np.rot90(data2dCor, 3))
-        data2dCor = np.require(data2dCor, np.uint8, "C")
-        heightCor, widthCor = data2dCor.shape
-        bytesLineCor, _ = data2dCor.strides
-
-        qImgCor = QImage(data2dCor, widthCor, heightCor, bytesLineCor, QImage.Format.Format_Grayscale8)
-        qImgCor = qImgCor.convertToFormat(QImage.Format.Format_ARGB32)
-
-        tempCor = self.maskCoverImg[:, self.newYVal, :, :]  # 2D data for coronal
-        tempCor = np.fliplr(np.rot90(tempCor, 3))
-        tempCor = np.require(tempCor, np.uint8, "C")
-        maskCorH, maskCorW = tempCor[:, :, 0].shape
-        maskBytesLineCor, _ = tempCor[:, :, 0].strides
-
-        curMaskCorIm = QImage(tempCor, maskCorW, maskCorH, maskBytesLineCor, QImage.Format.Format_ARGB32)
+        data2dCor = self.data4dImg[:, self.newYVal, :, self.curSliceIndex].T
+        tempCor = self.maskCoverImg[:, self.newYVal, :, :].transpose(1, 0, 2)  # 2D data for coronal
+        imCor = overlayMask(data2dCor, tempCor, self.planeBuffers(data2dCor.shape))
+        heightCor, widthCor = imCor.shape[:2]
 
-        self.imCorPIL = qImToPIL(qImgCor); maskCor = qImToPIL(curMaskCorIm)
-        self.imCorPIL.paste(maskCor, mask=maskCor)
-        self.pixmapCor = QPixmap.fromImage(ImageQt(self.imCorPIL))
-        self.corPlane.setPixmap(self.pixmapCor.scaled(
-            self.corPlane.width(), self.corPlane.height(), Qt.AspectRatioMode.KeepAspectRatio))
+        qImgCor = QImage(imCor, widthCor, heightCor, imCor.strides[0], QImage.Format.Format_ARGB32)
+        self.pixmapCor = QPixmap.fromImage(qImgCor)
+        self.basePixmapCor = self.pixmapCor.scaled(
+            self.corPlane.width(), self.corPlane.height(), Qt.AspectRatioMode.KeepAspectRatio)
+        self.corPlane.setPixmap(self.basePixmapCor)
 
     def acceptRoi(self):
         # 2d interpolation
@@ -793,17 +793,13 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
             if not self.drawingNeg:
                 self.interpolatedPoints.append(newROI)
                 self.pointsPlotted.append([self.curPointsPlottedX, self.curPointsPlottedY])
-            for i in range(len(self.interpolatedPoints)):
-                for j in range(len(self.interpolatedPoints[i])):
-                    self.maskCoverImg[self.interpolatedPoints[i][j][0], self.interpolatedPoints[i][j][1], self.interpolatedPoints[i][j][2],
-                    ] = [0, 0, 255, int(self.curAlpha)]
+            for points in self.interpolatedPoints:
+                paintVoxels(self.maskCoverImg, points, [0, 0, 255, int(self.curAlpha)])
             if self.drawingNeg:
                 self.negInterpolatedPoints.append(newROI)
                 self.pointsPlotted.append([self.curPointsPlottedX, self.curPointsPlottedY])
-                for i in range(len(self.negInterpolatedPoints)):
-                    for j in range(len(self.negInterpolatedPoints[i])):
-                        self.maskCoverImg[self.negInterpolatedPoints[i][j][0], self.negInterpolatedPoints[i][j][1], self.negInterpolatedPoints[i][j][2],
-                        ] = [0, 255, 0, int(self.curAlpha)]
+                for points in self.negInterpolatedPoints:
+                    paintVoxels(self.maskCoverImg, points, [0, 255, 0, int(self.curAlpha)])
             self.updateCrosshairs()
             self.curPointsPlottedX = []; self.curPointsPlottedY = []
             self.planesDrawn.append([self.painted, self.paintedSlice])
@@ -845,57 +841,23 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
 
     def undoLastPoint(self):
         if len(self.curPointsPlottedX) != 0:
-            self.maskCoverImg[self.curPointsPlottedX[-1]]
             self.curPointsPlottedX.pop()
             self.curPointsPlottedY.pop()
             self.maskCoverImg.fill(0)
-            for i in range(len(self.interpolatedPoints)):
-                for j in range(len(self.interpolatedPoints[i])):
-                    self.maskCoverImg[
-                        self.interpolatedPoints[i][j][0],
-                        self.interpolatedPoints[i][j][1],
-                        self.interpolatedPoints[i][j][2],
-                    ] = [0, 0, 255, int(self.curAlpha)]
-            for i in range(len(self.curPointsPlottedX)):
-                if self.painted == "ax":
-                    if self.drawingNeg:
-                        self.maskCoverImg[
-                            int(self.curPointsPlottedX[i]),
-                            int(self.curPointsPlottedY[i]),
-                            self.newZVal,
-                        ] = [0, 255, 0, int(self.curAlpha)]
-                    else:
-                        self.maskCoverImg[
-                            int(self.curPointsPlottedX[i]),
-                            int(self.curPointsPlottedY[i]),
-                            self.newZVal,
-                        ] = [0, 0, 255, int(self.curAlpha)]
-                elif self.painted == "sag":
-                    if self.drawingNeg:
-                        self.maskCoverImg[
-                            self.newXVal,
-                            int(self.curPointsPlottedY[i]),
-                            int(self.curPointsPlottedX[i]),
-                        ] = [0, 255, 0, int(self.curAlpha)]
-                    else:
-                        self.maskCoverImg[
-                            self.newXVal,
-                            int(self.curPointsPlottedY[i]),
-                            int(self.curPointsPlottedX[i]),
-                        ] = [0, 0, 255, int(self.curAlpha)]
-                elif self.painted == "cor":
-                    if self.drawingNeg:
-                        self.maskCoverImg[
-                            int(self.curPointsPlottedX[i]),
-                            self.newYVal,
-                            int(self.curPointsPlottedY[i]),
-                        ] = [0, 255, 0, int(self.curAlpha)]
-                    else:
-                        self.maskCoverImg[
-                            int(self.curPointsPlottedX[i]),
-                            self.newYVal,
-                            int(self.curPointsPlottedY[i]),
-                        ] = [0, 0, 255, int(self.curAlpha)]
+            for points in self.interpolatedPoints:
+                paintVoxels(self.maskCoverImg, points, [0, 0, 255, int(self.curAlpha)])
+            if self.drawingNeg:
+                color = [0, 255, 0, int(self.curAlpha)]
+            else:
+                color = [0, 0, 255, int(self.curAlpha)]
+            xs = np.asarray(self.curPointsPlottedX, dtype=int)
+            ys = np.asarray(self.curPointsPlottedY, dtype=int)
+            if self.painted == "ax":
+                self.maskCoverImg[xs, ys, self.newZVal] = color
+            elif self.painted == "sag":
+                self.maskCoverImg[self.newXVal, ys, xs] = color
+            elif self.painted == "cor":
+                self.maskCoverImg[xs, self.newYVal, ys] = color
 
             self.updateCrosshairs()
         if not len(self.curPointsPlottedX):
@@ -905,7 +867,7 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
     def moveToTic(self):
         del self.ticAnalysisGui
         self.ticAnalysisGui = TicAnalysisGUI()
-        if self.bmode4dImg is not None:
+        if self.bmodeNibImg is not None:
             self.ticAnalysisGui.toggleButton.show()
             if self.toggleButton.isChecked():
                 self.ticAnalysisGui.toggleButton.setChecked(True)
@@ -915,6 +877,7 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
         self.ticAnalysisGui.interpolatedPoints = self.interpolatedPoints
         self.ticAnalysisGui.voxelScale = self.voxelScale
         self.ticAnalysisGui.ceus4dImg = self.ceus4dImg
+        self.ticAnalysisGui.bmodeNibImg = self.bmodeNibImg
         self.ticAnalysisGui.bmode4dImg = self.bmode4dImg
         self.ticAnalysisGui.data4dImg = self.data4dImg
         self.ticAnalysisGui.curSliceIndex = self.curSliceIndex
@@ -938,10 +901,8 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
             self.interpolatedPoints = self.prevInterpolatedPoints
             self.prevInterpolatedPoints = []
             self.backToPrevVoiButton.hide()
-            for i in range(len(self.interpolatedPoints)):
-                for j in range(len(self.interpolatedPoints[i])):
-                    self.maskCoverImg[self.interpolatedPoints[i][j][0], self.interpolatedPoints[i][j][1], self.interpolatedPoints[i][j][2],
-                    ] = [0, 0, 255, int(self.curAlpha)]
+            for points in self.interpolatedPoints:
+                paintVoxels(self.maskCoverImg, points, [0, 0, 255, int(self.curAlpha)])
             self.alphaValueChanged()
 
     def startRoiDraw(self):
@@ -971,19 +932,12 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
             self.maskCoverImg.fill(0)
             if not self.drawingNeg:
                 self.interpolatedPoints.pop()
-            for i in range(len(self.interpolatedPoints)):
-                for j in range(len(self.interpolatedPoints[i])):
-                    self.maskCoverImg[
-                        self.interpolatedPoints[i][j][0],
-                        self.interpolatedPoints[i][j][1],
-                        self.interpolatedPoints[i][j][2],
-                    ] = [0, 0, 255, int(self.curAlpha)]
+            for points in self.interpolatedPoints:
+                paintVoxels(self.maskCoverImg, points, [0, 0, 255, int(self.curAlpha)])
             if self.drawingNeg:
                 self.negInterpolatedPoints.pop()
-                for i in range(len(self.negInterpolatedPoints)):
-                    for j in range(len(self.negInterpolatedPoints[i])):
-                        self.maskCoverImg[self.negInterpolatedPoints[i][j][0], self.negInterpolatedPoints[i][j][1], self.negInterpolatedPoints[i][j][2],
-                        ] = [0, 255, 0, int(self.curAlpha)]
+                for points in self.negInterpolatedPoints:
+                    paintVoxels(self.maskCoverImg, points, [0, 255, 0, int(self.curAlpha)])
             self.updateCrosshairs()
 
     def complete3dInterpolation(self):
@@ -997,10 +951,7 @@ class VoiSelectionGUI(Ui_constructVoi, QWidget):
                 print("shit")
                 return
             else:
-                points = set()
-                for group in np.array(pointsPlotted):
-                    for point in group:
-                        points.add(tuple(point))
+                points = {tuple(point) for point in chain.from_iterable(pointsPlotted)}
 
             pointsPlotted = []
             if not self.drawingNeg:
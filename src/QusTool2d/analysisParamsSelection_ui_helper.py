@@ -1,3 +1,4 @@
+import os
 import platform
 
 import numpy as np
@@ -242,15 +243,11 @@ class AnalysisParamsGUI(Ui_analysisParams, QWidget):
         self.latOverlapVal.setValue(0)
         self.windowThresholdVal.setValue(50)
 
-        mplPixWidth = max(self.spectralData.splineX) - min(
-            self.spectralData.splineX
-        )
+        mplPixWidth = self.spectralData.splineX.max() - self.spectralData.splineX.min()
         imPixWidth = mplPixWidth * self.spectralData.lateralRes
         mmWidth = self.spectralData.lateralRes * imPixWidth  # (mm/pixel)*pixels
 
-        mplPixHeight = max(self.spectralData.splineY) - min(
-            self.spectralData.splineY
-        )
+        mplPixHeight = self.spectralData.splineY.max() - self.spectralData.splineY.min()
         imPixHeight = mplPixHeight * self.spectralData.axialRes
         mmHeight = self.spectralData.axialRes * imPixHeight  # (mm/pixel)*pixels
 
@@ -260,17 +257,18 @@ class AnalysisParamsGUI(Ui_analysisParams, QWidget):
         # self.updateRoiSize()
 
     def updateRoiSize(self):
-        if self.axWinSizeVal.value() > 0 and self.latWinSizeVal.value() > 0:
+        axialRSize = self.axWinSizeVal.value()
+        lateralRSize = self.latWinSizeVal.value()
+        if axialRSize > 0 and lateralRSize > 0:
             self.axWavelengthRatioVal.setText(
-                str(np.round(self.axWinSizeVal.value() / self.spectralData.waveLength, decimals=2))
+                str(np.round(axialRSize / self.spectralData.waveLength, decimals=2))
             )
             self.latWavelengthRatioVal.setText(
-                str(np.round(self.latWinSizeVal.value() / self.spectralData.waveLength, decimals=2))
+                str(np.round(lateralRSize / self.spectralData.waveLength, decimals=2))
             )
 
             self.maskCoverMesh.fill(0)
-            axialRSize = self.axWinSizeVal.value()
-            lateralRSize = self.latWinSizeVal.value()
+            meshHeight, meshWidth = self.maskCoverMesh.shape[:2]
             axialRes = self.spectralData.axialRes
             lateralRes = self.spectralData.lateralRes
             axialSize = round(axialRSize / axialRes)  # in pixels :: mm/(mm/pixel)
@@ -278,35 +276,26 @@ class AnalysisParamsGUI(Ui_analysisParams, QWidget):
             axialOverlap = self.axOverlapVal.value() / 100
             lateralOverlap = self.latOverlapVal.value() / 100
 
-            xScale = self.spectralData.roiWidthScale / (self.spectralData.pixWidth)
-            yScale = self.spectralData.roiDepthScale / (self.spectralData.pixDepth)
-            x = self.spectralData.splineX / xScale
-            y = self.spectralData.splineY / yScale
-
-            # Some axial/lateral dims
-            axialSize = round(axialRSize / axialRes)  # in pixels :: mm/(mm/pixel)
-            lateralSize = round(lateralRSize / lateralRes)
-
             # Overlap fraction determines the incremental distance between ROIs
             axialIncrement = axialSize * (1 - axialOverlap)
             lateralIncrement = lateralSize * (1 - lateralOverlap)
 
-            for x in np.arange(0, self.maskCoverMesh.shape[0], axialIncrement):
-                ind = round(x)
-                if ind < self.maskCoverMesh.shape[0]:
-                    self.maskCoverMesh[ind - 2 : ind + 2, 0:] = [0, 255, 255, 255]
+            axialInds = np.round(np.arange(0, meshHeight, axialIncrement)).astype(int)
+            axialInds = axialInds[(axialInds >= 2) & (axialInds < meshHeight)]
+            axialRows = (axialInds[:, None] + np.arange(-2, 2)).ravel()
+            axialRows = axialRows[axialRows < meshHeight]
+            self.maskCoverMesh[axialRows, 0:] = [0, 255, 255, 255]
 
-            for y in np.arange(0, self.maskCoverMesh.shape[1], lateralIncrement):
-                ind = round(y)
-                if ind < self.maskCoverMesh.shape[1]:
-                    self.maskCoverMesh[0:, ind] = [0, 255, 255, 255]
+            lateralInds = np.round(np.arange(0, meshWidth, lateralIncrement)).astype(int)
+            lateralInds = lateralInds[lateralInds < meshWidth]
+            self.maskCoverMesh[0:, lateralInds] = [0, 255, 255, 255]
 
             self.maskCoverMesh = np.require(self.maskCoverMesh, np.uint8, "C")
             self.bytesLineMesh, _ = self.maskCoverMesh[:, :, 0].strides
             self.qImgMesh = QImage(
                 self.maskCoverMesh,
-                self.maskCoverMesh.shape[1],
-                self.maskCoverMesh.shape[0],
+                meshWidth,
+                meshHeight,
                 self.bytesLineMesh,
                 QImage.Format.Format_ARGB32,
             )
@@ -318,10 +307,10 @@ class AnalysisParamsGUI(Ui_analysisParams, QWidget):
             )
 
     def plotRoiPreview(self):
-        self.minX = min(self.spectralData.splineX)
-        self.maxX = max(self.spectralData.splineX)
-        self.minY = min(self.spectralData.splineY)
-        self.maxY = max(self.spectralData.splineY)
+        self.minX = self.spectralData.splineX.min()
+        self.maxX = self.spectralData.splineX.max()
+        self.minY = self.spectralData.splineY.min()
+        self.maxY = self.spectralData.splineY.max()
 
         quotient = (self.maxX - self.minX) / (self.maxY - self.minY)
         if quotient > (341 / 231):
@@ -357,17 +346,12 @@ class AnalysisParamsGUI(Ui_analysisParams, QWidget):
         self.maskCoverImg = np.zeros((self.yLen, self.xLen, 4))
         self.maskCoverMesh = np.zeros((self.yLenBmode, self.xLenBmode, 4))
 
-        for i in range(len(self.spectralData.splineX)):
-            self.maskCoverImg[
-                max(round(self.spectralData.splineY[i] - self.minY - 1), 0) : max(
-                    round(self.spectralData.splineY[i] - self.minY - 1), 0
-                )
-                + 2,
-                max(round(self.spectralData.splineX[i] - self.minX - 1), 0) : max(
-                    round(self.spectralData.splineX[i] - self.minX - 1), 0
-                )
-                + 2,
-            ] = [255, 255, 0, 255]
+        splineRows = np.maximum(np.round(self.spectralData.splineY - self.minY - 1), 0).astype(int)
+        splineCols = np.maximum(np.round(self.spectralData.splineX - self.minX - 1), 0).astype(int)
+        stampRows = (splineRows[:, None] + np.array([0, 0, 1, 1])).ravel()
+        stampCols = (splineCols[:, None] + np.array([0, 1, 0, 1])).ravel()
+        inBounds = (stampRows < self.yLen) & (stampCols < self.xLen)
+        self.maskCoverImg[stampRows[inBounds], stampCols[inBounds]] = [255, 255, 0, 255]
 
         self.maskCoverImg = np.require(self.maskCoverImg, np.uint8, "C")
         self.bytesLineMask, _ = self.maskCoverImg[:, :, 0].strides
@@ -425,8 +409,8 @@ class AnalysisParamsGUI(Ui_analysisParams, QWidget):
         self.rfAnalysisGUI = RfAnalysisGUI()
         self.rfAnalysisGUI.spectralData = self.spectralData
         self.rfAnalysisGUI.setFilenameDisplays(
-            self.imagePathInput.text().split("/")[-1],
-            self.phantomPathInput.text().split("/")[-1],
+            os.path.basename(self.imagePathInput.text()),
+            os.path.basename(self.phantomPathInput.text()),
         )
         success = self.rfAnalysisGUI.completeSpectralAnalysis()
 
@@ -445,4 +429,4 @@ if __name__ == "__main__":
     ui = AnalysisParamsGUI()
     # ui.selectImage.show()
     ui.show()
-    sys.exit(app.exec_())
+    sys.exit(app.exec())
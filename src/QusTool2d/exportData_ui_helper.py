@@ -299,5 +299,5 @@ if __name__ == "__main__":
     ui = ExportDataGUI()
     # ui.selectImage.show()
     ui.show()
-    sys.exit(app.exec_())
+    sys.exit(app.exec())
 
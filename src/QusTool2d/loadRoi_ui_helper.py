@@ -2,6 +2,7 @@ import os
 import pickle
 from pathlib import Path
 
+import numpy as np
 from PyQt6.QtWidgets import QWidget, QFileDialog
 from src.QusTool2d.loadRoi_ui import Ui_loadRoi
 import src.QusTool2d.roiSelection_ui_helper as RoiSelectionSection
@@ -21,7 +22,6 @@ class LoadRoiGUI(Ui_loadRoi, QWidget):
     def backToChoice(self):
         self.wrongImageWarning.hide()
         self.hide()
-        self.chooseRoiGUI.show()
 
     def chooseFile(self):
         fileName, _ = QFileDialog.getOpenFileName(None, "Open file", filter="*.pkl")
@@ -32,8 +32,9 @@ class LoadRoiGUI(Ui_loadRoi, QWidget):
         self.roiPathInput.clear()
 
     def getRoiPath(self):
-        if os.path.exists(self.roiPathInput.text()):
-            with open(self.roiPathInput.text(), "rb") as f:
+        roiPath = self.roiPathInput.text()
+        if os.path.exists(roiPath):
+            with open(roiPath, "rb") as f:
                 roiInfo = pickle.load(f)
 
             if (Path(self.chooseRoiGUI.imagePathInput.text()).stem != Path(roiInfo["Image Name"]).stem or 
@@ -42,8 +43,8 @@ class LoadRoiGUI(Ui_loadRoi, QWidget):
                 self.wrongImageWarning.show()
                 return
             
-            self.chooseRoiGUI.spectralData.splineX = roiInfo["Spline X"]
-            self.chooseRoiGUI.spectralData.splineY = roiInfo["Spline Y"]
+            self.chooseRoiGUI.spectralData.splineX = np.asarray(roiInfo["Spline X"], dtype=np.float64)
+            self.chooseRoiGUI.spectralData.splineY = np.asarray(roiInfo["Spline Y"], dtype=np.float64)
             self.chooseRoiGUI.plotOnCanvas()
             self.chooseRoiGUI.acceptLoadedRoiButton.setHidden(False)
             self.chooseRoiGUI.undoLoadedRoiButton.setHidden(False)
@@ -56,4 +57,3 @@ class LoadRoiGUI(Ui_loadRoi, QWidget):
             self.chooseRoiGUI.closeRoiButton.setHidden(True)
 
             self.hide()
-            self.chooseRoiGUI.show()
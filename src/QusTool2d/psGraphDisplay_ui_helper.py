@@ -1,5 +1,3 @@
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from PyQt6.QtWidgets import QWidget, QHBoxLayout
 import pyqtgraph as pg
 
@@ -27,3 +25,19 @@ class PsGraphDisplay(Ui_psGraphWidget, QWidget):
         self.plotGraph.setLabel("bottom", "Frequency (MHz)")
         self.horizontalLayout.addWidget(self.plotGraph)
 
+        self.npsCurves = []
+        self.avNpsCurve = self.plotGraph.plot(pen=pg.mkPen(color="r", width=2))
+        self.lobfCurve = self.plotGraph.plot(pen=pg.mkPen(color=(255, 172, 28), width=2))
+        self.lowBandLine = self.plotGraph.plot(pen=pg.mkPen(color="m", width=2))
+        self.upBandLine = self.plotGraph.plot(pen=pg.mkPen(color="m", width=2))
+
+    def setNpsCurves(self, f, npsArr):
+        # One translucent item per window so overlapping curves still darken where windows agree
+        while len(self.npsCurves) < len(npsArr):
+            curve = self.plotGraph.plot(pen=pg.mkPen(color=(0, 0, 255, 51)))
+            curve.setZValue(-1)
+            self.npsCurves.append(curve)
+        for curve, nps in zip(self.npsCurves, npsArr):
+            curve.setData(f, nps)
+        for curve in self.npsCurves[len(npsArr):]:
+            curve.clear()
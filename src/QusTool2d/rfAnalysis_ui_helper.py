@@ -2,10 +2,11 @@ import platform
 
 import numpy as np
 import pandas as pd
-import matplotlib
 import matplotlib.pyplot as plt
-import pyqtgraph as pg
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
+from matplotlib.widgets import Cursor
 from PyQt6.QtWidgets import QWidget, QHBoxLayout
 
 from pyquantus.qus import SpectralData
@@ -18,134 +19,62 @@ from src.QusTool2d.windowsTooLarge_ui_helper import WindowsTooLargeGUI
 
 system = platform.system()
 
+windowsStyleSheets = (
+    (
+        ("roiSidebarLabel", "imageSelectionLabelSidebar", "analysisParamsLabel", "rfAnalysisLabel", "exportResultsLabel"),
+        """QLabel {
+            font-size: 18px;
+            color: rgb(255, 255, 255);
+            background-color: rgba(255, 255, 255, 0);
+            border: 0px;
+            font-weight: bold;
+        }""",
+    ),
+    (
+        ("imageLabel", "phantomLabel"),
+        """QLabel {
+            font-size: 13px;
+            color: rgb(255, 255, 255);
+            background-color: rgba(255, 255, 255, 0);
+            border: 0px;
+            font-weight: bold;
+        }""",
+    ),
+    (
+        ("imagePathInput", "phantomPathInput"),
+        """QLabel {
+            font-size: 11px;
+            color: rgb(255, 255, 255);
+            background-color: rgba(255, 255, 255, 0);
+            border: 0px;
+        }""",
+    ),
+    (
+        ("avMbfLabel", "avSsLabel", "avSiLabel", "avMbfVal", "avSsVal", "avSiVal"),
+        """QLabel {
+            font-size: 14px;
+            color: white;
+            background-color: rgba(0,0,0,0);
+        }""",
+    ),
+)
+
+
+def quantizedTicks(lo, hi, scale, divisor):
+    return ((np.linspace(lo, hi, 5) * scale).astype(int) / divisor).tolist()
+
 
 class RfAnalysisGUI(QWidget, Ui_rfAnalysis):
+    legendTickPositions = (0, 0.25, 0.5, 0.75, 1)
+
     def __init__(self):
         super().__init__()
         self.setupUi(self)
 
         if system == "Windows":
-            self.roiSidebarLabel.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight: bold;
-            }"""
-            )
-            self.imageSelectionLabelSidebar.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight: bold;
-            }"""
-            )
-            self.imageLabel.setStyleSheet(
-                """QLabel {
-                font-size: 13px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight: bold;
-            }"""
-            )
-            self.phantomLabel.setStyleSheet(
-                """QLabel {
-                font-size: 13px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight: bold;
-            }"""
-            )
-            self.imagePathInput.setStyleSheet(
-                """QLabel {
-                font-size: 11px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-            }"""
-            )
-            self.phantomPathInput.setStyleSheet(
-                """QLabel {
-                font-size: 11px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-            }"""
-            )
-            self.analysisParamsLabel.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight:bold;
-            }"""
-            )
-            self.rfAnalysisLabel.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight:bold;
-            }"""
-            )
-            self.exportResultsLabel.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight:bold;
-            }"""
-            )
-            self.avMbfLabel.setStyleSheet(
-                """QLabel {
-                font-size: 14px;
-                color: white;
-            background-color: rgba(0,0,0,0);
-            }"""
-            )
-            self.avSsLabel.setStyleSheet(
-                """QLabel {
-                font-size: 14px;
-                color: white;
-                background-color: rgba(0,0,0,0);
-            }"""
-            )
-            self.avSiLabel.setStyleSheet(
-                """QLabel {
-                font-size: 14px;
-                color: white;
-                background-color: rgba(0,0,0,0);
-            }"""
-            )
-            self.avMbfVal.setStyleSheet(
-                """QLabel {
-                font-size: 14px;
-                color: white;
-                background-color: rgba(0,0,0,0);
-            }"""
-            )
-            self.avSsVal.setStyleSheet(
-                """QLabel {
-                font-size: 14px;
-                color: white;
-                background-color: rgba(0,0,0,0);
-            }"""
-            )
-            self.avSiVal.setStyleSheet(
-                """QLabel {
-                font-size: 14px;
-                color: white;
-                background-color: rgba(0,0,0,0);
-            }"""
-            )
+            for names, styleSheet in windowsStyleSheets:
+                for name in names:
+                    getattr(self, name).setStyleSheet(styleSheet)
 
         self.exportDataGUI = ExportDataGUI()
         self.lastGui: AnalysisParamsSelection.AnalysisParamsGUI
@@ -155,6 +84,8 @@ class RfAnalysisGUI(QWidget, Ui_rfAnalysis):
         self.saveConfigGUI = SaveConfigGUI()
         self.windowsTooLargeGUI = WindowsTooLargeGUI()
         self.selectedImage: np.ndarray | None = None
+        self.imPlot = None
+        self.splinePlot = None
 
         # Display B-Mode
         self.horizontalLayout = QHBoxLayout(self.imDisplayFrame)
@@ -163,6 +94,10 @@ class RfAnalysisGUI(QWidget, Ui_rfAnalysis):
         self.ax = self.figure.add_subplot(111)
         self.canvas = FigureCanvas(self.figure)
         self.horizontalLayout.addWidget(self.canvas)
+        self.cursor = Cursor(
+            self.ax, color="gold", linewidth=0.4, useblit=True
+        )
+        self.cursor.set_active(False)
 
         self.displayMbfButton.setCheckable(True)
         self.displaySiButton.setCheckable(True)
@@ -178,6 +113,11 @@ class RfAnalysisGUI(QWidget, Ui_rfAnalysis):
         self.figLeg = plt.figure()
         self.legAx = self.figLeg.add_subplot(111)
         self.cax = self.figLeg.add_axes([0, 0.1, 0.35, 0.8])
+        self.legendCmaps = {"MBF": plt.get_cmap("viridis"), "SS": plt.get_cmap("magma"), "SI": plt.get_cmap("plasma")}
+        self.legendMappable = ScalarMappable(norm=Normalize(0, 1), cmap=self.legendCmaps["MBF"])
+        self.figLeg.colorbar(orientation="vertical", cax=self.cax, mappable=self.legendMappable)
+        self.legendLabel = self.legAx.text(0, 0, "", rotation=270)
+        self.legAx.set_visible(False)
         self.canvasLeg = FigureCanvas(self.figLeg)
         self.horizLayoutLeg.addWidget(self.canvasLeg)
         self.canvasLeg.draw()
@@ -186,6 +126,7 @@ class RfAnalysisGUI(QWidget, Ui_rfAnalysis):
         self.displayNpsButton.clicked.connect(self.displayNps)
         self.displayNpsButton.setCheckable(True)
         self.saveConfigButton.clicked.connect(self.saveConfig)
+        self.lastLegendDisp = None
         self.updateLegend("clear")
 
     def saveConfig(self):
@@ -209,21 +150,20 @@ class RfAnalysisGUI(QWidget, Ui_rfAnalysis):
         if hasattr(self.spectralData, 'scConfig'):
             self.spectralData.scanConvertCmaps()
 
-        mbfMean = np.mean(self.spectralData.mbfArr)
-        ssMean = np.mean(self.spectralData.ssArr)
-        siMean = np.mean(self.spectralData.siArr)
-        self.avMbfVal.setText(f"{np.round(mbfMean, decimals=1)}")
-        self.avSsVal.setText(f"{np.round(ssMean*1e6, decimals=2)}")
-        self.avSiVal.setText(f"{np.round(siMean, decimals=1)}")
+        self.mbfMean = np.mean(self.spectralData.mbfArr)
+        self.ssMean = np.mean(self.spectralData.ssArr)
+        self.siMean = np.mean(self.spectralData.siArr)
+        self.avMbfVal.setText(f"{np.round(self.mbfMean, decimals=1)}")
+        self.avSsVal.setText(f"{np.round(self.ssMean*1e6, decimals=2)}")
+        self.avSiVal.setText(f"{np.round(self.siMean, decimals=1)}")
 
-        npsArr = [window.results.nps for window in self.spectralData.spectralAnalysis.roiWindows]
-        avNps = np.mean(npsArr, axis=0)
-        f = self.spectralData.spectralAnalysis.roiWindows[0].results.f
-        x = np.linspace(min(f), max(f), 100)
-        y = ssMean*x + siMean
-
-        del self.psGraphDisplay
-        self.psGraphDisplay = PsGraphDisplay()
+        npsArr = np.array([window.results.nps for window in self.spectralData.spectralAnalysis.roiWindows])
+        avNps = npsArr.mean(axis=0)
+        npsMin, npsMax = npsArr.min(), npsArr.max()
+        fMhz = self.spectralData.spectralAnalysis.roiWindows[0].results.f / 1e6
+        xMhz = np.linspace(fMhz.min(), fMhz.max(), 100)
+        y = (self.ssMean*1e6)*xMhz + self.siMean  # SS is per Hz
+        bandMhz = [freq/1e6 for freq in self.spectralData.analysisFreqBand]
 
         # ps = self.spectralData.spectralAnalysis.roiWindows[0].results.ps
         # rps = self.spectralData.spectralAnalysis.roiWindows[0].results.rPs
@@ -232,15 +172,12 @@ class RfAnalysisGUI(QWidget, Ui_rfAnalysis):
         # self.psGraphDisplay.plotGraph.plot(f/1e6, rps, pen=pg.mkPen(color="r"), name="rPS")
         # self.psGraphDisplay.plotGraph.plot(f/1e6, nps+np.amin(ps), pen=pg.mkPen(color="g"), name="NPS")
 
-        for nps in npsArr:
-            self.psGraphDisplay.plotGraph.plot(f/1e6, nps, pen=pg.mkPen(color=(0, 0, 255, 51)))
-        self.psGraphDisplay.plotGraph.plot(f/1e6, avNps, pen=pg.mkPen(color="r", width=2))
-        self.psGraphDisplay.plotGraph.plot(x/1e6, y, pen=pg.mkPen(color=(255, 172, 28), width=2))
-        self.psGraphDisplay.plotGraph.plot(2*[self.spectralData.analysisFreqBand[0]/1e6], [np.amin(npsArr), np.amax(npsArr)], 
-                                            pen=pg.mkPen(color="m", width=2))
-        self.psGraphDisplay.plotGraph.plot(2*[self.spectralData.analysisFreqBand[1]/1e6], [np.amin(npsArr), np.amax(npsArr)], 
-                                            pen=pg.mkPen(color="m", width=2))
-        self.psGraphDisplay.plotGraph.setYRange(np.amin(npsArr), np.amax(npsArr))
+        self.psGraphDisplay.setNpsCurves(fMhz, npsArr)
+        self.psGraphDisplay.avNpsCurve.setData(fMhz, avNps)
+        self.psGraphDisplay.lobfCurve.setData(xMhz, y)
+        self.psGraphDisplay.lowBandLine.setData(2*[bandMhz[0]], [npsMin, npsMax])
+        self.psGraphDisplay.upBandLine.setData(2*[bandMhz[1]], [npsMin, npsMax])
+        self.psGraphDisplay.plotGraph.setYRange(npsMin, npsMax)
 
         self.plotOnCanvas()
         return 0
@@ -256,20 +193,20 @@ class RfAnalysisGUI(QWidget, Ui_rfAnalysis):
         del self.exportDataGUI
         self.exportDataGUI = ExportDataGUI()
         curData = {
-                "Patient": [self.imagePathInput.text()],
-                "Phantom": [self.phantomPathInput.text()],
-                "Midband Fit (MBF)": [np.mean(self.spectralData.mbfArr)],
-                "Spectral Slope (SS)": [np.mean(self.spectralData.ssArr)],
-                "Spectral Intercept (SI)": [np.mean(self.spectralData.siArr)],
-                "Attenuation Coefficient": [self.spectralData.spectralAnalysis.attenuationCoef],
-                "Attenuation Coefficient R-Score": [self.spectralData.spectralAnalysis.attenuationCorr],
-                "Backscatter Coefficient": [self.spectralData.spectralAnalysis.backScatterCoef],
-                "Nakagami Params": [f"{self.spectralData.spectralAnalysis.nakagamiParams}"],
-                "Effective Scatterer Diameter": [self.spectralData.spectralAnalysis.effectiveScattererDiameter],
-                "Effective Scatterer Concentration": [self.spectralData.spectralAnalysis.effectiveScattererConcentration],
+                "Patient": self.imagePathInput.text(),
+                "Phantom": self.phantomPathInput.text(),
+                "Midband Fit (MBF)": self.mbfMean,
+                "Spectral Slope (SS)": self.ssMean,
+                "Spectral Intercept (SI)": self.siMean,
+                "Attenuation Coefficient": self.spectralData.spectralAnalysis.attenuationCoef,
+                "Attenuation Coefficient R-Score": self.spectralData.spectralAnalysis.attenuationCorr,
+                "Backscatter Coefficient": self.spectralData.spectralAnalysis.backScatterCoef,
+                "Nakagami Params": f"{self.spectralData.spectralAnalysis.nakagamiParams}",
+                "Effective Scatterer Diameter": self.spectralData.spectralAnalysis.effectiveScattererDiameter,
+                "Effective Scatterer Concentration": self.spectralData.spectralAnalysis.effectiveScattererConcentration,
                 "ROI Name": ""
             }
-        self.exportDataGUI.dataFrame = pd.DataFrame.from_dict(curData)
+        self.exportDataGUI.dataFrame = pd.DataFrame([curData])
         self.exportDataGUI.lastGui = self
         self.exportDataGUI.setFilenameDisplays(
             self.imagePathInput.text(), self.phantomPathInput.text()
@@ -291,29 +228,31 @@ class RfAnalysisGUI(QWidget, Ui_rfAnalysis):
         self.phantomPathInput.setText(phantomName)
 
     def plotOnCanvas(self):  # Plot current image on GUI
-        self.ax.clear()
         self.selectedImage = self.spectralData.finalBmode if self.selectedImage is None else self.selectedImage
         quotient = self.spectralData.depth / self.spectralData.width
-        self.ax.imshow(self.selectedImage, aspect=quotient*(self.selectedImage.shape[1]/self.selectedImage.shape[0]))
-        self.figure.set_facecolor((0, 0, 0, 0))
-        self.ax.axis("off")
+        aspect = quotient*(self.selectedImage.shape[1]/self.selectedImage.shape[0])
+        if self.imPlot is None:
+            self.imPlot = self.ax.imshow(self.selectedImage, aspect=aspect)
+            self.figure.set_facecolor((0, 0, 0, 0))
+            self.ax.axis("off")
 
-        self.ax.plot(
-            self.spectralData.splineX,
-            self.spectralData.splineY,
-            color="cyan",
-            zorder=1,
-            linewidth=0.75,
-        )
-        self.figure.subplots_adjust(
-            left=0, right=1, bottom=0, top=1, hspace=0.2, wspace=0.2
-        )
-        self.cursor = matplotlib.widgets.Cursor(
-            self.ax, color="gold", linewidth=0.4, useblit=True
-        )
-        self.cursor.set_active(False)
+            self.splinePlot, = self.ax.plot(
+                self.spectralData.splineX,
+                self.spectralData.splineY,
+                color="cyan",
+                zorder=1,
+                linewidth=0.75,
+            )
+            self.figure.subplots_adjust(
+                left=0, right=1, bottom=0, top=1, hspace=0.2, wspace=0.2
+            )
+        else:
+            self.imPlot.set_data(self.selectedImage)
+            self.imPlot.set_extent((-0.5, self.selectedImage.shape[1]-0.5, self.selectedImage.shape[0]-0.5, -0.5))
+            self.ax.set_aspect(aspect)
+            self.splinePlot.set_data(self.spectralData.splineX, self.spectralData.splineY)
         plt.tick_params(bottom=False, left=False, labelbottom=False, labelleft=False)
-        self.canvas.draw()  # Refresh canvas
+        self.canvas.draw_idle()  # Refresh canvas
 
     def mbfChecked(self):
         if self.displayMbfButton.isChecked():
@@ -340,7 +279,6 @@ class RfAnalysisGUI(QWidget, Ui_rfAnalysis):
         self.plotOnCanvas()
         
     def siChecked(self):
-        global curDisp
         if self.displaySiButton.isChecked():
             if self.displayMbfButton.isChecked() or self.displaySsButton.isChecked():
                 self.displayMbfButton.setChecked(False)
@@ -353,72 +291,47 @@ class RfAnalysisGUI(QWidget, Ui_rfAnalysis):
         self.plotOnCanvas()
 
     def updateLegend(self, curDisp):
-        self.legAx.clear()
+        if curDisp == "":
+            curDisp = "clear"
+        if curDisp == self.lastLegendDisp:
+            return
+        self.lastLegendDisp = curDisp
+
         self.figLeg.set_visible(True)
-        a = np.array([[0, 1]])
         if curDisp == "MBF":
-            img = self.legAx.imshow(a, cmap="viridis")
-            self.legAx.set_visible(False)
-            # cax = plt.axes([0, 0.1, 0.25, 0.8])
-            self.figLeg.colorbar(
-                orientation="vertical", cax=self.cax, mappable=img
-            )
-            self.legAx.text(2.1, 0.21, "Midband Fit", rotation=270, size=9)
+            self.legendMappable.set_cmap(self.legendCmaps["MBF"])
+            self.legendLabel.set(text="Midband Fit", position=(2.1, 0.21), size=9)
             self.legAx.tick_params("y", labelsize=7, pad=0.5)
             # plt.text(3, 0.17, "Midband Fit", rotation=270, size=5)
             # plt.tick_params('y', labelsize=5, pad=0.7)
-            self.cax.set_yticks([0, 0.25, 0.5, 0.75, 1])
+            self.cax.set_yticks(self.legendTickPositions)
             self.cax.set_yticklabels(
-                [
-                    int(self.spectralData.minMbf * 10) / 10,
-                    int((((self.spectralData.maxMbf - self.spectralData.minMbf) / 4) + self.spectralData.minMbf) * 10) / 10,
-                    int((((self.spectralData.maxMbf - self.spectralData.minMbf) / 2) + self.spectralData.minMbf) * 10) / 10,
-                    int(((3 * (self.spectralData.maxMbf - self.spectralData.minMbf) / 4) + self.spectralData.minMbf) * 10) / 10,
-                    int(self.spectralData.maxMbf * 10) / 10,
-                ]
+                quantizedTicks(self.spectralData.minMbf, self.spectralData.maxMbf, 10, 10)
             )
         elif curDisp == "SS":
-            img = self.legAx.imshow(a, cmap="magma")
-            self.legAx.set_visible(False)
-            # cax = plt.axes([0, 0.1, 0.25, 0.8])
-            self.figLeg.colorbar(orientation="vertical", cax=self.cax, mappable=img)
-            self.legAx.text(2.2, 0, "Spectral Slope (1e-6)", rotation=270, size=6)
+            self.legendMappable.set_cmap(self.legendCmaps["SS"])
+            self.legendLabel.set(text="Spectral Slope (1e-6)", position=(2.2, 0), size=6)
             self.legAx.tick_params("y", labelsize=7, pad=0.7)
             # plt.text(3, 0.02, "Spectral Slope (1e-6)", rotation=270, size=4)
             # plt.tick_params('y', labelsize=4, pad=0.3)
-            self.cax.set_yticks([0, 0.25, 0.5, 0.75, 1])
+            self.cax.set_yticks(self.legendTickPositions)
             self.cax.set_yticklabels(
-                [
-                    int(self.spectralData.minSs * 100000000) / 100,
-                    int((((self.spectralData.maxSs - self.spectralData.minSs) / 4) + self.spectralData.minSs) * 10000000) / 100,
-                    int((((self.spectralData.maxSs - self.spectralData.minSs) / 2) + self.spectralData.minSs) * 100000000) / 100,
-                    int(((3 * (self.spectralData.maxSs - self.spectralData.minSs) / 4) + self.spectralData.minSs) * 100000000) / 100,
-                    int(self.spectralData.maxSs * 100000000) / 100,
-                ]
+                quantizedTicks(self.spectralData.minSs, self.spectralData.maxSs, 100000000, 100)
             )
         elif curDisp == "SI":
-            img = self.legAx.imshow(a, cmap="plasma")
-            self.legAx.set_visible(False)
-            # cax = plt.axes([0, 0.1, 0.25, 0.8])
-            self.figLeg.colorbar(orientation="vertical", cax=self.cax, mappable=img)
-            self.legAx.text(2.2, 0.09, "Spectral Intercept", rotation=270, size=6)
+            self.legendMappable.set_cmap(self.legendCmaps["SI"])
+            self.legendLabel.set(text="Spectral Intercept", position=(2.2, 0.09), size=6)
             self.legAx.tick_params("y", labelsize=7, pad=0.7)
             # plt.text(3, 0, "Spectral Intercept", rotation=270, size=5)
             # plt.tick_params('y', labelsize=5, pad=0.7)
-            self.cax.set_yticks([0, 0.25, 0.5, 0.75, 1])
+            self.cax.set_yticks(self.legendTickPositions)
             self.cax.set_yticklabels(
-                [
-                    int(self.spectralData.minSi * 10) / 10,
-                    int((((self.spectralData.maxSi - self.spectralData.minSi) / 4) + self.spectralData.minSi) * 10) / 10,
-                    int((((self.spectralData.maxSi - self.spectralData.minSi) / 2) + self.spectralData.minSi) * 10) / 10,
-                    int(((3 * (self.spectralData.maxSi - self.spectralData.minSi) / 4) + self.spectralData.minSi) * 10) / 10,
-                    int(self.spectralData.maxSi * 10) / 10,
-                ]
+                quantizedTicks(self.spectralData.minSi, self.spectralData.maxSi, 10, 10)
             )
-        elif curDisp == "" or curDisp == "clear":
+        elif curDisp == "clear":
             self.figLeg.set_visible(False)
         self.figLeg.set_facecolor((1, 1, 1, 1))
         # self.horizLayoutLeg.removeWidget(self.canvasLeg)
         # self.canvasLeg = FigureCanvas(self.figLeg)
         # self.horizLayoutLeg.addWidget(self.canvasLeg)
-        self.canvasLeg.draw()
\ No newline at end of file
+        self.canvasLeg.draw_idle()
\ No newline at end of file
@@ -1,147 +1,109 @@
 import os
 import platform
+import threading
 
 import numpy as np
-from PIL import Image, ImageEnhance
+from PIL import Image, ImageEnhance, ImageStat
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import scipy.interpolate as interpolate
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.widgets import RectangleSelector, Cursor
 import matplotlib.patches as patches
 
 from PyQt6.QtWidgets import QWidget, QHBoxLayout
-from PyQt6.QtGui import QImage
 
 from pyquantus.parse.objects import ScConfig
 from pyquantus.qus import UltrasoundImage, AnalysisConfig, SpectralAnalysis, SpectralData
 from pyquantus.parse.terason import terasonRfParser
 from pyquantus.parse.canon import canonIqParser
-import src.Parsers.verasonicsMatParser as vera
 from src.QusTool2d.roiSelection_ui import Ui_constructRoi
 from src.QusTool2d.editImageDisplay_ui_helper import EditImageDisplayGUI
 from src.QusTool2d.analysisParamsSelection_ui_helper import AnalysisParamsGUI
 import src.QusTool2d.selectImage_ui_helper as SelectImageSection
 from src.QusTool2d.loadRoi_ui_helper import LoadRoiGUI
 from src.QusTool2d.saveRoi_ui_helper import SaveRoiGUI
+from src.Utils.spline import calculateSpline
 
 system = platform.system()
 
+windowsStyleSheets = (
+    (
+        ("roiSidebarLabel", "imageSelectionLabelSidebar", "analysisParamsLabel", "rfAnalysisLabel", "exportResultsLabel"),
+        """QLabel {
+            font-size: 18px;
+            color: rgb(255, 255, 255);
+            background-color: rgba(255, 255, 255, 0);
+            border: 0px;
+            font-weight: bold;
+        }""",
+    ),
+    (
+        ("imageLabel", "phantomLabel"),
+        """QLabel {
+            font-size: 13px;
+            color: rgb(255, 255, 255);
+            background-color: rgba(255, 255, 255, 0);
+            border: 0px;
+            font-weight: bold;
+        }""",
+    ),
+    (
+        ("imagePathInput", "phantomPathInput"),
+        """QLabel {
+            font-size: 11px;
+            color: rgb(255, 255, 255);
+            background-color: rgba(255, 255, 255, 0);
+            border: 0px;
+        }""",
+    ),
+)
+
 
 class RoiSelectionGUI(QWidget, Ui_constructRoi):
+    initiallyHidden = (
+        "imagePathInput",
+        "phantomPathInput",
+        "drawRoiButton",
+        "closeRoiButton",
+        "undoLastPtButton",
+        "redrawRoiButton",
+        "acceptRoiButton",
+        "undoLoadedRoiButton",
+        "acceptLoadedRoiButton",
+        "userDrawRectangleButton",
+        "drawFreehandButton",
+        "backFromFreehandButton",
+        "backFromRectangleButton",
+        "acceptRectangleButton",
+        "physicalRectDimsLabel",
+        "physicalRectHeightLabel",
+        "physicalRectWidthLabel",
+        "physicalRectHeightVal",
+        "physicalRectWidthVal",
+    )
+
     def __init__(self):
         super().__init__()
         self.setupUi(self)
 
         if system == "Windows":
-            self.roiSidebarLabel.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight: bold;
-            }"""
-            )
-            self.imageSelectionLabelSidebar.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight: bold;
-            }"""
-            )
-            self.imageLabel.setStyleSheet(
-                """QLabel {
-                font-size: 13px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight: bold;
-            }"""
-            )
-            self.phantomLabel.setStyleSheet(
-                """QLabel {
-                font-size: 13px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight: bold;
-            }"""
-            )
-            self.imagePathInput.setStyleSheet(
-                """QLabel {
-                font-size: 11px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-            }"""
-            )
-            self.phantomPathInput.setStyleSheet(
-                """QLabel {
-                font-size: 11px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-            }"""
-            )
-            self.analysisParamsLabel.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight:bold;
-            }"""
-            )
-            self.rfAnalysisLabel.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight:bold;
-            }"""
-            )
-            self.exportResultsLabel.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight:bold;
-            }"""
-            )
+            for names, styleSheet in windowsStyleSheets:
+                for name in names:
+                    getattr(self, name).setStyleSheet(styleSheet)
 
-        self.imagePathInput.setHidden(True)
-        self.phantomPathInput.setHidden(True)
-        self.drawRoiButton.setHidden(True)
-        self.closeRoiButton.setHidden(True)
-        self.undoLastPtButton.setHidden(True)
-        self.redrawRoiButton.setHidden(True)
-        self.acceptRoiButton.setHidden(True)
-        self.undoLoadedRoiButton.setHidden(True)
-        self.acceptLoadedRoiButton.setHidden(True)
-        self.userDrawRectangleButton.setHidden(True)
-        self.drawFreehandButton.setHidden(True)
-        self.backFromFreehandButton.setHidden(True)
-        self.backFromRectangleButton.setHidden(True)
-        self.acceptRectangleButton.setHidden(True)
-        self.physicalRectDimsLabel.setHidden(True)
-        self.physicalRectHeightLabel.setHidden(True)
-        self.physicalRectWidthLabel.setHidden(True)
-        self.physicalRectHeightVal.setHidden(True)
-        self.physicalRectWidthVal.setHidden(True)
+        for name in self.initiallyHidden:
+            getattr(self, name).setHidden(True)
         self.acceptLoadedRoiButton.clicked.connect(self.acceptROI)
         self.acceptRectangleButton.clicked.connect(self.acceptRect)
         self.undoLoadedRoiButton.clicked.connect(self.undoRoiLoad)
 
-        self.loadRoiGUI = LoadRoiGUI()
-        self.saveRoiGUI = SaveRoiGUI()
+        # Secondary windows are built on first use
+        self.loadRoiGUI = None
+        self.saveRoiGUI = None
         self.ultrasoundImage = UltrasoundImage()
         self.pointsPlottedX = []
         self.pointsPlottedY = []
         self.frame = 0
+        self.lastBmodeSettings = None
 
         # Prepare B-Mode display plot
         self.horizontalLayout = QHBoxLayout(self.imDisplayFrame)
@@ -158,7 +120,7 @@ class RoiSelectionGUI(QWidget, Ui_constructRoi):
         )
         self.editImageDisplayGUI.sharpnessVal.valueChanged.connect(self.changeSharpness)
 
-        self.analysisParamsGUI = AnalysisParamsGUI()
+        self.analysisParamsGUI = None
 
         self.scatteredPoints = []
         self.spectralData: SpectralData
@@ -194,7 +156,6 @@ class RoiSelectionGUI(QWidget, Ui_constructRoi):
         self.saveRoiButton.clicked.connect(self.saveRoi)
 
     def saveRoi(self):
-        del self.saveRoiGUI
         self.saveRoiGUI = SaveRoiGUI()
         self.acceptRect(moveOn=False)
         self.saveRoiGUI.splineX = self.spectralData.splineX
@@ -215,6 +176,8 @@ class RoiSelectionGUI(QWidget, Ui_constructRoi):
         self.undoLastRoi()
 
     def openLoadRoiWindow(self):
+        if self.loadRoiGUI is None:
+            self.loadRoiGUI = LoadRoiGUI()
         self.loadRoiGUI.chooseRoiGUI = self
         self.loadRoiGUI.show()
 
@@ -364,7 +327,7 @@ class RoiSelectionGUI(QWidget, Ui_constructRoi):
         )
         self.crosshairCursor.set_active(False)
         plt.tick_params(bottom=False, left=False, labelbottom=False, labelleft=False)
-        self.canvas.draw()  # Refresh canvas
+        self.canvas.draw_idle()  # Refresh canvas
 
     def openImageVerasonics(
         self, imageFilePath, phantomFilePath
@@ -464,45 +427,26 @@ class RoiSelectionGUI(QWidget, Ui_constructRoi):
 
         self.displayInitialImage()
 
-    def updateImageDisplay(self, cvIm):
-        enhancer = ImageEnhance.Contrast(cvIm)
-        imOutput = enhancer.enhance(self.editImageDisplayGUI.contrastVal.value())
-        bright = ImageEnhance.Brightness(imOutput)
-        imOutput = bright.enhance(self.editImageDisplayGUI.brightnessVal.value())
+    def updateImageDisplay(self, cvIm, contrast, brightness, sharpness):
+        # Contrast and brightness are per-pixel maps, so apply both in one LUT pass
+        mean = int(ImageStat.Stat(cvIm.convert("L")).mean[0] + 0.5)
+        lut = contrastBrightnessLut(mean, contrast, brightness).tolist()
+        imOutput = cvIm.point(lut * len(cvIm.getbands()))
         sharp = ImageEnhance.Sharpness(imOutput)
-        imOutput = sharp.enhance(self.editImageDisplayGUI.sharpnessVal.value())
+        imOutput = sharp.enhance(sharpness)
         return np.array(imOutput)
 
 
     def displayInitialImage(self):
-        flippedIm = np.flipud(self.spectralData.finalBmode).astype(np.uint8)
-
-        qIm = QImage(
-            flippedIm.data,
-            flippedIm.shape[1],
-            flippedIm.shape[0],
-            flippedIm.strides[0],
-            QImage.Format.Format_RGB888,
-        )
-
-        qIm.mirrored().save(
-            os.path.join("Junk", "bModeImRaw.png")
-        )  # Save as .png file
+        bmodeIm = self.spectralData.finalBmode.astype(np.uint8, order="C")
+        self.bmodeRawIm = Image.fromarray(bmodeIm)
+        saveInBackground(self.bmodeRawIm, os.path.join("Junk", "bModeImRaw.png"))
+        self.lastBmodeSettings = None
 
         if hasattr(self.spectralData, 'scConfig'):
-            flippedIm = np.flipud(self.spectralData.bmode).astype(np.uint8)
-
-            qIm = QImage(
-                flippedIm.data,
-                flippedIm.shape[1],
-                flippedIm.shape[0],
-                flippedIm.strides[0],
-                QImage.Format.Format_RGB888,
-            )
-
-            qIm.mirrored().save(
-                os.path.join("Junk", "bModeImRawPreSc.png")
-            )  # Save as .png file
+            bmodeIm = self.spectralData.bmode.astype(np.uint8, order="C")
+            self.bmodePreScRawIm = Image.fromarray(bmodeIm)
+            saveInBackground(self.bmodePreScRawIm, os.path.join("Junk", "bModeImRawPreSc.png"))
 
         self.spectralData.spectralAnalysis.initAnalysisConfig()
 
@@ -559,7 +503,7 @@ class RoiSelectionGUI(QWidget, Ui_constructRoi):
                         color="cyan",
                         linewidth=0.75,
                     )
-            self.canvas.draw()
+            self.canvas.draw_idle()
             self.drawRoiButton.setChecked(True)
             self.recordDrawRoiClicked()
 
@@ -615,12 +559,19 @@ class RoiSelectionGUI(QWidget, Ui_constructRoi):
     def updateBModeSettings(
         self,
     ):  # Updates background photo when image settings are modified
-        cvIm = Image.open(os.path.join("Junk", "bModeImRaw.png"))
-        self.spectralData.finalBmode = self.updateImageDisplay(cvIm)
+        bmodeSettings = (
+            self.editImageDisplayGUI.contrastVal.value(),
+            self.editImageDisplayGUI.brightnessVal.value(),
+            self.editImageDisplayGUI.sharpnessVal.value(),
+        )
+        if bmodeSettings == self.lastBmodeSettings:
+            return
+        self.lastBmodeSettings = bmodeSettings
+
+        self.spectralData.finalBmode = self.updateImageDisplay(self.bmodeRawIm, *bmodeSettings)
 
         if hasattr(self.spectralData, 'scConfig'):
-            cvIm = Image.open(os.path.join("Junk", "bModeImRawPreSc.png"))
-            self.spectralData.bmode = self.updateImageDisplay(cvIm)
+            self.spectralData.bmode = self.updateImageDisplay(self.bmodePreScRawIm, *bmodeSettings)
         
         self.plotOnCanvas()
 
@@ -681,8 +632,8 @@ class RoiSelectionGUI(QWidget, Ui_constructRoi):
                 oldSpline.remove()
 
             xSpline, ySpline = calculateSpline(self.pointsPlottedX, self.pointsPlottedY)
-            xSpline = np.clip(xSpline, a_min=0, a_max=self.spectralData.pixWidth-1)
-            ySpline = np.clip(ySpline, a_min=0, a_max=self.spectralData.pixDepth-1)
+            np.clip(xSpline, a_min=0, a_max=self.spectralData.pixWidth-1, out=xSpline)
+            np.clip(ySpline, a_min=0, a_max=self.spectralData.pixDepth-1, out=ySpline)
             self.spline = self.ax.plot(
                 xSpline, ySpline, color="cyan", zorder=1, linewidth=0.75
             )
@@ -700,7 +651,7 @@ class RoiSelectionGUI(QWidget, Ui_constructRoi):
                 zorder=500,
             )
         )
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
     def drawRect(self, event1, event2):
         try:
@@ -799,7 +750,7 @@ class RoiSelectionGUI(QWidget, Ui_constructRoi):
                 left=0, right=1, bottom=0, top=1, hspace=0.2, wspace=0.2
             )
             self.ax.tick_params(bottom=False, left=False)
-            self.canvas.draw()
+            self.canvas.draw_idle()
 
     def acceptRect(self, moveOn=True):
         if len(self.ax.patches) == 1:
@@ -831,6 +782,8 @@ class RoiSelectionGUI(QWidget, Ui_constructRoi):
 
     def acceptROI(self):
         if len(self.spectralData.splineX) > 1 and len(self.spectralData.splineX) == len(self.spectralData.splineY):
+            if self.analysisParamsGUI is None:
+                self.analysisParamsGUI = AnalysisParamsGUI()
             self.analysisParamsGUI.spectralData = self.spectralData
             self.analysisParamsGUI.initParams()
             self.analysisParamsGUI.lastGui = self
@@ -844,16 +797,14 @@ class RoiSelectionGUI(QWidget, Ui_constructRoi):
             self.hide()
 
 
-def calculateSpline(xpts, ypts):  # 2D spline interpolation
-    cv = []
-    for i in range(len(xpts)):
-        cv.append([xpts[i], ypts[i]])
-    cv = np.array(cv)
-    if len(xpts) == 2:
-        tck, _ = interpolate.splprep(cv.T, s=0.0, k=1)
-    elif len(xpts) == 3:
-        tck, _ = interpolate.splprep(cv.T, s=0.0, k=2)
-    else:
-        tck, _ = interpolate.splprep(cv.T, s=0.0, k=3)
-    x, y = np.array(interpolate.splev(np.linspace(0, 1, 1000), tck))
-    return x, y
+def saveInBackground(im, path):
+    # The Junk PNGs are only a record of the raw B-mode; encode them off the UI thread
+    threading.Thread(target=im.save, args=(path,), daemon=True).start()
+
+
+def contrastBrightnessLut(mean, contrast, brightness):
+    # Matches ImageEnhance.Contrast followed by ImageEnhance.Brightness on 8-bit data
+    values = np.arange(256, dtype=np.float32)
+    mean = np.float32(mean)
+    contrasted = np.clip(mean + np.float32(contrast) * (values - mean), 0, 255).astype(np.uint8)
+    return np.clip(np.float32(brightness) * contrasted.astype(np.float32), 0, 255).astype(np.uint8)
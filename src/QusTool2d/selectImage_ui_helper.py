@@ -1,9 +1,11 @@
 import os
 import platform
 import shutil
+import tempfile
+import threading
+from functools import lru_cache
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import numpy as np
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QImage, QPixmap
@@ -18,140 +20,148 @@ from pyquantus.qus import SpectralData
 from pyquantus.parse.objects import ScConfig
 from src.QusTool2d.loadingScreen_ui_helper import LoadingScreenGUI
 from src.QusTool2d.selectImage_ui import Ui_selectImage
-from src.QusTool2d.roiSelection_ui_helper import RoiSelectionGUI
 import src.Parsers.philips3dRf as phil3d
 
 system = platform.system()
 
+# Skip per-entry icon and symlink probing, which dominates listing time on network mounts
+fileDialogOptions = (
+    QFileDialog.Option.DontUseCustomDirectoryIcons | QFileDialog.Option.DontResolveSymlinks
+)
+lastDirectory = ""
+roiSelectionCacheSize = 2
+
+windowsStyleSheets = (
+    (
+        ("roiSidebarLabel", "imageSelectionLabelSidebar", "analysisParamsLabel", "rfAnalysisLabel", "exportResultsLabel"),
+        """QLabel {
+            font-size: 18px;
+            color: rgb(255, 255, 255);
+            background-color: rgba(255, 255, 255, 0);
+            border: 0px;
+            font-weight: bold;
+        }""",
+    ),
+    (
+        ("imageLabel", "phantomLabel"),
+        """QLabel {
+            font-size: 13px;
+            color: rgb(255, 255, 255);
+            background-color: rgba(255, 255, 255, 0);
+            border: 0px;
+            font-weight: bold;
+        }""",
+    ),
+    (
+        ("imageFilenameDisplay", "phantomFilenameDisplay"),
+        """QLabel {
+            font-size: 11px;
+            color: rgb(255, 255, 255);
+            background-color: rgba(255, 255, 255, 0);
+            border: 0px;
+        }""",
+    ),
+)
+# Other platforms keep the .ui styling, so the platform check is made once at import
+platformStyleSheets = windowsStyleSheets if system == "Windows" else ()
+
 
 def selectImageHelper(pathInput, fileExts):
+    global lastDirectory
     if not os.path.exists(pathInput.text()):  # check if file path is manually typed
         # NOTE: .bin is currently not supported
-        fileName, _ = QFileDialog.getOpenFileName(None, "Open File", filter=fileExts)
+        fileName, _ = QFileDialog.getOpenFileName(
+            None, "Open File", lastDirectory, filter=fileExts, options=fileDialogOptions
+        )
         if fileName != "":  # If valid file is chosen
             pathInput.setText(fileName)
+            lastDirectory = os.path.dirname(fileName)
         else:
             return
 
 
+def clearInBackground(path):
+    # Rename first so the fresh folder can be made at once; the old drawings are deleted off the UI thread
+    stale = tempfile.mkdtemp(prefix=path + ".", dir=os.path.dirname(os.path.abspath(path)))
+    os.replace(path, os.path.join(stale, path))
+    threading.Thread(target=shutil.rmtree, args=(stale,), kwargs={"ignore_errors": True}, daemon=True).start()
+
+
+def presetOf(path):
+    # Retrying after fixing the other path re-reads the same header; key on mtime/size so edits still invalidate
+    st = os.stat(path)
+    return cachedPreset(path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=32)
+def cachedPreset(path, mtime, size):
+    return findPreset(path)
+
+
 class SelectImageGUI_QusTool2dIQ(Ui_selectImage, QWidget):
+    verasonicsXPositions = (
+        ("chooseImageFileButton", 625),
+        ("clearImagePathButton", 765),
+        ("imagePathInput", 655),
+    )
+    # Machines whose files open straight into the ROI page, by RoiSelectionGUI method
+    roiSelectionOpeners = {
+        "Verasonics": "openImageVerasonics",
+        "Canon": "openImageCanon",
+        "Terason": "openImageTerason",
+    }
+    # Machines that go through frame selection on this page first
+    frameSelectionOpeners = {
+        "Clarius": "openClariusImage",
+        "Philips": "openPhilipsImage",
+        "Siemens": "openSiemensImage",
+    }
+    initiallyHidden = (
+        "chooseImageFileButton",
+        "choosePhantomFileButton",
+        "chooseImageFolderButton",
+        "choosePhantomFolderButton",
+        "clearImagePathButton",
+        "clearPhantomPathButton",
+        "selectImageErrorMsg",
+        "generateImageButton",
+        "imagePathInput",
+        "phantomPathInput",
+        "selectDataLabel",
+        "imageFilenameDisplay",
+        "phantomFilenameDisplay",
+        "imagePathLabelCanon",
+        "phantomPathLabelCanon",
+        "imagePathLabelClarius",
+        "phantomPathLabelClarius",
+        "imagePathLabelVerasonics",
+        "phantomPathLabelVerasonics",
+        "imagePathLabel",
+        "phantomPathLabel",
+        "acceptFrameButton",
+        "totalFramesLabel",
+        "ofFramesLabel",
+        "curFrameSlider",
+        "curFrameLabel",
+        "imPreview",
+        "selectFrameLabel",
+        "philips3dCheckBox",
+    )
+
     def __init__(self):
         super().__init__()
         self.setupUi(self)
 
-        if system == "Windows":
-            self.roiSidebarLabel.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight: bold;
-            }"""
-            )
-            self.imageSelectionLabelSidebar.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight: bold;
-            }"""
-            )
-            self.imageLabel.setStyleSheet(
-                """QLabel {
-                font-size: 13px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight: bold;
-            }"""
-            )
-            self.phantomLabel.setStyleSheet(
-                """QLabel {
-                font-size: 13px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight: bold;
-            }"""
-            )
-            self.imageFilenameDisplay.setStyleSheet(
-                """QLabel {
-                font-size: 11px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-            }"""
-            )
-            self.phantomFilenameDisplay.setStyleSheet(
-                """QLabel {
-                font-size: 11px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-            }"""
-            )
-            self.analysisParamsLabel.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight:bold;
-            }"""
-            )
-            self.rfAnalysisLabel.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight:bold;
-            }"""
-            )
-            self.exportResultsLabel.setStyleSheet(
-                """QLabel {
-                font-size: 18px;
-                color: rgb(255, 255, 255);
-                background-color: rgba(255, 255, 255, 0);
-                border: 0px;
-                font-weight:bold;
-            }"""
-            )
+        for names, styleSheet in platformStyleSheets:
+            for name in names:
+                getattr(self, name).setStyleSheet(styleSheet)
 
-        self.chooseImageFileButton.setHidden(True)
-        self.choosePhantomFileButton.setHidden(True)
-        self.chooseImageFolderButton.setHidden(True)
-        self.choosePhantomFolderButton.setHidden(True)
-        self.clearImagePathButton.setHidden(True)
-        self.clearPhantomPathButton.setHidden(True)
-        self.selectImageErrorMsg.setHidden(True)
-        self.generateImageButton.setHidden(True)
-        self.imagePathInput.setHidden(True)
-        self.phantomPathInput.setHidden(True)
-        self.selectDataLabel.setHidden(True)
-        self.imageFilenameDisplay.setHidden(True)
-        self.phantomFilenameDisplay.setHidden(True)
-        self.imagePathLabelCanon.setHidden(True)
-        self.phantomPathLabelCanon.setHidden(True)
-        self.imagePathLabelClarius.setHidden(True)
-        self.phantomPathLabelClarius.setHidden(True)
-        self.imagePathLabelVerasonics.setHidden(True)
-        self.phantomPathLabelVerasonics.setHidden(True)
-        self.imagePathLabel.setHidden(True)
-        self.phantomPathLabel.setHidden(True)
-        self.acceptFrameButton.setHidden(True)
-        self.totalFramesLabel.setHidden(True)
-        self.ofFramesLabel.setHidden(True)
-        self.curFrameSlider.setHidden(True)
-        self.curFrameLabel.setHidden(True)
-        self.imPreview.setHidden(True)
-        self.selectFrameLabel.setHidden(True)
-        self.philips3dCheckBox.setHidden(True)
+        for name in self.initiallyHidden:
+            getattr(self, name).setHidden(True)
 
         self.welcomeGui: QWidget
         self.roiSelectionGUI = None
+        self.roiSelectionCache = {}
         self.machine = None
         self.fileExts = None
         self.frame = 0
@@ -176,53 +186,54 @@ class SelectImageGUI_QusTool2dIQ(Ui_selectImage, QWidget):
         self.hide()
 
     def moveToRoiSelection(self):
+        imagePath = self.imagePathInput.text()
         if self.machine == "Verasonics":
-            self.phantomPathInput.setText(self.imagePathInput.text())
-        if os.path.exists(self.imagePathInput.text()) and os.path.exists(
-            self.phantomPathInput.text()
-        ):
+            self.phantomPathInput.setText(imagePath)
+        phantomPath = self.phantomPathInput.text()
+        if os.path.isfile(imagePath) and os.path.isfile(phantomPath):
             self.loadingScreen.show()
             QApplication.processEvents()
-            if self.roiSelectionGUI is not None:
-                plt.close(self.roiSelectionGUI.figure)
-            del self.roiSelectionGUI
-            self.roiSelectionGUI = RoiSelectionGUI()
-            self.roiSelectionGUI.spectralData = SpectralData()
-            self.roiSelectionGUI.setFilenameDisplays(
-                self.imagePathInput.text().split("/")[-1],
-                self.phantomPathInput.text().split("/")[-1],
+            # Deferred so opening this screen doesn't pull in the ROI page and pyplot
+            import matplotlib.pyplot as plt
+            from src.QusTool2d.roiSelection_ui_helper import RoiSelectionGUI
+
+            # Going back and regenerating from the same unchanged files reuses the parsed ROI page
+            cacheKey = (
+                self.machine,
+                imagePath,
+                phantomPath,
+                os.stat(imagePath).st_mtime_ns,
+                os.stat(phantomPath).st_mtime_ns,
             )
-            if self.machine == "Verasonics":
-                self.roiSelectionGUI.openImageVerasonics(
-                    self.imagePathInput.text(), self.phantomPathInput.text()
+            if self.roiSelectionGUI is not None and all(
+                gui is not self.roiSelectionGUI for gui in self.roiSelectionCache.values()
+            ):
+                plt.close(self.roiSelectionGUI.figure)
+            self.roiSelectionGUI = self.roiSelectionCache.get(cacheKey)
+            if self.roiSelectionGUI is None:
+                self.roiSelectionGUI = RoiSelectionGUI()
+                self.roiSelectionGUI.spectralData = SpectralData()
+                self.roiSelectionGUI.setFilenameDisplays(
+                    os.path.basename(imagePath), os.path.basename(phantomPath)
                 )
-            elif self.machine == "Canon":
-                preset1 = findPreset(self.imagePathInput.text())
-                preset2 = findPreset(self.phantomPathInput.text())
-                if preset1 == preset2:
-                    self.roiSelectionGUI.openImageCanon(
-                        self.imagePathInput.text(), self.phantomPathInput.text()
-                    )
-                else:
+                if self.machine in self.frameSelectionOpeners:
+                    getattr(self, self.frameSelectionOpeners[self.machine])()
+                    return
+                opener = self.roiSelectionOpeners.get(self.machine)
+                if opener is None:
+                    print("ERROR: Machine match not found")
+                    return
+                if self.machine == "Canon" and presetOf(imagePath) != presetOf(phantomPath):
                     self.selectImageErrorMsg.setText("ERROR: Presets don't match")
                     self.selectImageErrorMsg.setHidden(False)
                     return
-            elif self.machine == "Clarius":
-                self.openClariusImage()
-                return
-            elif self.machine == "Terason":
-                self.roiSelectionGUI.openImageTerason(
-                    self.imagePathInput.text(), self.phantomPathInput.text()
-                )
-            elif self.machine == "Philips":
-                self.openPhilipsImage()
-                return
-            elif self.machine == "Siemens":
-                self.openSiemensImage()
-                return
+                getattr(self.roiSelectionGUI, opener)(imagePath, phantomPath)
+                self.roiSelectionCache[cacheKey] = self.roiSelectionGUI
+                if len(self.roiSelectionCache) > roiSelectionCacheSize:
+                    plt.close(self.roiSelectionCache.pop(next(iter(self.roiSelectionCache))).figure)
             else:
-                print("ERROR: Machine match not found")
-                return
+                # Move the hit to the newest slot so the least recently used page is evicted first
+                self.roiSelectionCache[cacheKey] = self.roiSelectionCache.pop(cacheKey)
             self.roiSelectionGUI.show()
             self.roiSelectionGUI.lastGui = self
             self.selectImageErrorMsg.setHidden(True)
@@ -332,8 +343,7 @@ class SelectImageGUI_QusTool2dIQ(Ui_selectImage, QWidget):
         self.acceptFrame()
 
     def displaySlidingFrames(self):
-        self.imData = np.array(self.imArray[self.frame]).reshape(self.imArray.shape[1], self.imArray.shape[2])
-        self.imData = np.require(self.imData,np.uint8,'C')
+        self.imData = np.ascontiguousarray(self.imArray[self.frame], dtype=np.uint8)
         self.bytesLine = self.imData.strides[0]
         self.arHeight = self.imData.shape[0]
         self.arWidth = self.imData.shape[1]
@@ -425,8 +435,7 @@ class SelectImageGUI_QusTool2dIQ(Ui_selectImage, QWidget):
         self.hide()
 
     def plotPreviewFrame(self):
-        self.imData = np.array(self.imArray[self.frame]).reshape(self.imArray.shape[1], self.imArray.shape[2])
-        self.imData = np.require(self.imData,np.uint8,'C')
+        self.imData = np.ascontiguousarray(self.imArray[self.frame], dtype=np.uint8)
         self.qIm = QImage(self.imData, self.arWidth, self.arHeight, self.bytesLine, QImage.Format.Format_Grayscale8)
         self.imPreview.setPixmap(QPixmap.fromImage(self.qIm).scaled(self.imPreview.width(), self.imPreview.height(), Qt.AspectRatioMode.IgnoreAspectRatio))
         self.update()
@@ -464,7 +473,7 @@ class SelectImageGUI_QusTool2dIQ(Ui_selectImage, QWidget):
         self.phantomPathLabel.setText("Input Path to Phantom file\n (.rf, .mat)")
 
         self.machine = "Philips"
-        self.fileExts = "*.rf *.mat"
+        self.fileExts = "Philips RF or MATLAB files (*.rf *.mat)"
 
     def terasonClicked(self):
         self.chooseImagePrep()
@@ -478,7 +487,7 @@ class SelectImageGUI_QusTool2dIQ(Ui_selectImage, QWidget):
         self.phantomPathLabel.setText("Input Path to Phantom file\n (.mat)")
 
         self.machine = "Terason"
-        self.fileExts = "*.mat"
+        self.fileExts = "MATLAB files (*.mat)"
 
     def siemensClicked(self):
         self.chooseImagePrep()
@@ -492,7 +501,7 @@ class SelectImageGUI_QusTool2dIQ(Ui_selectImage, QWidget):
         self.phantomPathLabel.setText("Input Path to Phantom file\n (.rfd)")
 
         self.machine = "Siemens"
-        self.fileExts = "*.rfd"
+        self.fileExts = "Siemens RF files (*.rfd)"
 
     def canonClicked(
         self,
@@ -505,7 +514,7 @@ class SelectImageGUI_QusTool2dIQ(Ui_selectImage, QWidget):
         self.choosePhantomFileButton.setHidden(False)
 
         self.machine = "Canon"
-        self.fileExts = "*.bin"
+        self.fileExts = "Canon binary files (*.bin)"
 
     def clariusClicked(self):
         self.chooseImagePrep()
@@ -516,7 +525,7 @@ class SelectImageGUI_QusTool2dIQ(Ui_selectImage, QWidget):
         self.choosePhantomFileButton.setHidden(False)
 
         self.machine = "Clarius"
-        self.fileExts = "*.raw"
+        self.fileExts = "Clarius raw files (*.raw)"
 
     def verasonicsClicked(
         self,
@@ -529,26 +538,18 @@ class SelectImageGUI_QusTool2dIQ(Ui_selectImage, QWidget):
         self.phantomPathInput.setHidden(True)
         self.clearPhantomPathButton.setHidden(True)
 
-        imagePathLabelPos = self.imagePathLabelCanon.pos()
-        imagePathLabelPos.setX(625)
-        self.imagePathLabelVerasonics.move(imagePathLabelPos)
-        chooseImageFilePos = self.chooseImageFileButton.pos()
-        chooseImageFilePos.setX(625)
-        self.chooseImageFileButton.move(chooseImageFilePos)
-        clearImagePathPos = self.clearImagePathButton.pos()
-        clearImagePathPos.setX(765)
-        self.clearImagePathButton.move(clearImagePathPos)
-        imagePathPos = self.imagePathInput.pos()
-        imagePathPos.setX(655)
-        self.imagePathInput.move(imagePathPos)
+        self.imagePathLabelVerasonics.move(625, self.imagePathLabelCanon.y())
+        for name, x in self.verasonicsXPositions:
+            widget = getattr(self, name)
+            widget.move(x, widget.y())
 
         self.machine = "Verasonics"
-        self.fileExts = "*.mat"
+        self.fileExts = "MATLAB files (*.mat)"
 
     def selectImageFile(self):
         # Create folder to store ROI drawings
         if os.path.exists("Junk"):
-            shutil.rmtree("Junk")
+            clearInBackground("Junk")
         os.mkdir("Junk")
 
         selectImageHelper(self.imagePathInput, self.fileExts)
@@ -565,5 +566,5 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     ui = SelectImageGUI_QusTool2dIQ()
     ui.show()
-    sys.exit(app.exec_())
+    sys.exit(app.exec())
 
@@ -119,7 +119,6 @@ def paramap2d(img, mask, res, time, tf, compressfactor, windSize_x, windSize_y,
     # print('Prep For Loop:');print(str(datetime.now()));
     # start_time = datetime.now()
     #1a. Windowing and image info
-    global windSize, voxelscale, compression, imgshape, timeconst, times, xlist, ylist, zlist, typefit;
     windSize = (windSize_x, windSize_y);
     voxelscale = res;
     compression = compressfactor; 
@@ -1,5 +1,6 @@
 import io
 
+import numpy as np
 from PyQt6.QtCore import QBuffer, QEvent, QObject, QPoint, pyqtSignal
 from PyQt6.QtGui import QImage
 from PIL import Image
@@ -10,6 +11,38 @@ def qImToPIL(qIm: QImage) -> Image:
     qIm.save(buffer, "PNG")
     return Image.open(io.BytesIO(buffer.data()))
 
+def overlayMask(gray, mask, buffers=None):
+    # Blends every ARGB32 byte, alpha included, exactly as PIL's paste(mask, mask=mask) did.
+    # buffers are optional scratch arrays for this plane shape, reused so a redraw doesn't allocate
+    if buffers is None:
+        height, width = gray.shape
+        buffers = (
+            np.empty((height, width, 1), dtype=np.uint16),
+            np.empty((height, width, 4), dtype=np.uint16),
+            np.empty((height, width, 4), dtype=np.uint16),
+            np.empty((height, width, 4), dtype=np.uint8),
+        )
+    alpha, blended, scaled, out = buffers
+    np.copyto(alpha, mask[..., 3:])
+    np.multiply(mask, alpha, out=scaled)
+    np.subtract(255, alpha, out=alpha)
+    blended[..., :3] = gray[..., None]
+    blended[..., 3] = 255
+    blended *= alpha
+    blended += scaled
+    blended += 128
+    np.right_shift(blended, 8, out=scaled)
+    blended += scaled
+    blended >>= 8
+    np.copyto(out, blended, casting="unsafe")
+    return out
+
+def loadBmode(gui):
+    # The 3D CEUS pages share one B-mode volume, read from gui.bmodeNibImg on the first toggle
+    if gui.bmode4dImg is None and gui.bmodeNibImg is not None:
+        gui.bmode4dImg = np.asanyarray(gui.bmodeNibImg.dataobj).astype(np.uint8, copy=False)
+    return gui.bmode4dImg
+
 class MouseTracker(QObject):
     positionChanged = pyqtSignal(QPoint)
     positionClicked = pyqtSignal(QPoint)
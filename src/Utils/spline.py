@@ -1,27 +1,35 @@
+from functools import lru_cache
+
 import numpy as np
-import pyvista as pv
 import scipy.interpolate as interpolate
 from numpy.matlib import repmat
 
+splineEvalPoints = np.linspace(0, 1, 1000)
+
 
 def removeDuplicates(ar):
-    # Credit: https://stackoverflow.com/questions/480214/how-do-i-remove-duplicates-from-a-list-while-preserving-order
-    seen = set()
-    seenAdd = seen.add
-    return [x for x in ar if not (tuple(x) in seen or seenAdd(tuple(x)))]
+    # Pack each (x, y) pair into one int64 so np.unique can find first occurrences, then restore click order
+    ar = np.asarray(ar, dtype=np.int64)
+    keys = (ar[:, 0] << 32) | (ar[:, 1] & 0xFFFFFFFF)
+    _, firstIdx = np.unique(keys, return_index=True)
+    return ar[np.sort(firstIdx)]
 
 def calculateSpline(xpts, ypts):  # 2D spline interpolation
-    cv = []
-    for i in range(len(xpts)):
-        cv.append([xpts[i], ypts[i]])
-    cv = np.array(cv)
+    # Redraws re-request the spline for unchanged points; copy so callers can't alter the cache
+    x, y = cachedSpline(tuple(xpts), tuple(ypts))
+    return x.copy(), y.copy()
+
+
+@lru_cache(maxsize=64)
+def cachedSpline(xpts, ypts):
+    cv = np.column_stack((np.asarray(xpts), np.asarray(ypts)))
     if len(xpts) == 2:
         tck, _ = interpolate.splprep(cv.T, s=0.0, k=1)
     elif len(xpts) == 3:
         tck, _ = interpolate.splprep(cv.T, s=0.0, k=2)
     else:
         tck, _ = interpolate.splprep(cv.T, s=0.0, k=3)
-    x, y = np.array(interpolate.splev(np.linspace(0, 1, 1000), tck))
+    x, y = np.array(interpolate.splev(splineEvalPoints, tck))
     return x, y
 
 
@@ -47,6 +55,7 @@ def ellipsoidFitLS(pos):
 
 
 def calculateSpline3D(points):
+    import pyvista as pv
     cloud = pv.PolyData(points, force_float=False)
     volume = cloud.delaunay_3d(alpha=100)
     shell = volume.extract_geometry() # type: ignore
@@ -32,7 +32,6 @@ def paramap(
     # print('Prep For Loop:');print(str(datetime.now()));
     # start_time = datetime.now()
     # 1a. Windowing and image info
-    global windSize, voxelscale, compression, imgshape, timeconst, times, xlist, ylist, zlist, windows, typefit
     windSize = (windSize_x, windSize_y, windSize_z)
     voxelscale = res[0] * res[1] * res[2]
     compression = compressfactor